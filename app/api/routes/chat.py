@@ -7,20 +7,36 @@ LangGraph 에이전트를 호출하여 사용자 메시지를 처리합니다.
     POST /chat/          - 채팅 메시지 전송
 """
 
+import asyncio
+import time
 from collections.abc import AsyncGenerator
+from contextlib import aclosing, suppress
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
-from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, HumanMessage
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
 from loguru import logger
 
 from app.graph import get_lumi_graph
+from app.graph.state import LumiState, create_initial_state
+from app.repositories.session import get_session_repository
 from app.schemas.chat import ChatRequest, ChatResponse, StreamEvent
 
 router = APIRouter()
 
-# In-Memory 세션 저장소 (서버 재시작 시 초기화됨)
-SESSION_STORE: dict[str, list[BaseMessage]] = {}
+# SSE 토큰 묶음 전송 기준
+# - 토큰을 모아두었다가 아래 기준 중 하나를 넘으면 token 이벤트 하나로 전송
+# - thinking/response 이벤트 직전에는 순서 보장을 위해 항상 먼저 전송
+TOKEN_FLUSH_CHARS = 256
+TOKEN_FLUSH_INTERVAL = 0.05  # 초
+
+# 그래프 이벤트 큐 (느린 클라이언트 backpressure)
+# - 큐가 가득 차면 그래프 이벤트 소비를 멈추고 클라이언트가 따라올 때까지 대기
+# - STREAM_STALL_TIMEOUT초 동안 큐가 비워지지 않으면 그래프 실행을 중단
+STREAM_QUEUE_MAX = 64
+STREAM_STALL_TIMEOUT = 30.0  # 초
+
+_STREAM_END = object()
 
 
 @router.post("/", response_model=ChatResponse)
@@ -53,16 +69,11 @@ async def chat(request: ChatRequest) -> ChatResponse:
         graph = get_lumi_graph()
 
         # TODO 2: 초기 상태 생성
-        initial_state = {
-            "messages": [HumanMessage(content=request.message)],
-            "intent": None,
-            "retrieved_docs": [],
-            "tool_name": None,
-            "tool_args": None,
-            "tool_result": None,
-            "session_id": request.session_id,
-            "user_id": request.user_id,
-        }
+        initial_state = create_initial_state(
+            session_id=request.session_id,
+            user_id=request.user_id,
+            messages=[HumanMessage(content=request.message)],
+        )
 
         # TODO 3: 그래프 실행 (비동기)
         final_state = await graph.ainvoke(initial_state)
@@ -93,6 +104,43 @@ async def chat(request: ChatRequest) -> ChatResponse:
 
 
 # SSE 스트리밍 - Helper 함수
+async def _pump_graph_events(
+    graph, initial_state: LumiState, queue: asyncio.Queue
+) -> None:
+    """
+    graph.astream 이벤트를 크기 제한이 있는 큐로 옮깁니다.
+
+    큐가 가득 차면 put에서 대기하므로 그래프 소비 속도가 클라이언트 수신 속도에
+    맞춰집니다. 종료(정상/오류) 시 항상 _STREAM_END를 넣어 소비자를 깨웁니다.
+    취소(클라이언트 연결 종료)된 경우에는 소비자가 없으므로 큐가 가득 차 있어도
+    대기하지 않습니다.
+
+    Raises:
+        RuntimeError: STREAM_STALL_TIMEOUT초 동안 큐가 비워지지 않은 경우
+    """
+    cancelled = False
+    try:
+        async with aclosing(
+            graph.astream(initial_state, stream_mode=["updates", "messages"])
+        ) as events:
+            async for item in events:
+                try:
+                    await asyncio.wait_for(queue.put(item), STREAM_STALL_TIMEOUT)
+                except TimeoutError:
+                    raise RuntimeError(
+                        "클라이언트 수신이 지연되어 스트리밍을 중단합니다."
+                    ) from None
+    except asyncio.CancelledError:
+        cancelled = True
+        raise
+    finally:
+        if cancelled:
+            with suppress(asyncio.QueueFull):
+                queue.put_nowait(_STREAM_END)
+        else:
+            await queue.put(_STREAM_END)
+
+
 async def stream_with_status(
     message: str,
     session_id: str,
@@ -115,25 +163,21 @@ async def stream_with_status(
             - (None, None, final_response, tool_used): 최종 응답
     """
     graph = get_lumi_graph()
+    session_repo = get_session_repository()
 
     # 세션에서 이전 메시지 히스토리 가져오기
     session_id = session_id or "default"
-    history = SESSION_STORE.get(session_id, [])
+    history = await session_repo.get_history(session_id)
     new_message = HumanMessage(content=message)
 
     # 초기 상태 생성
-    initial_state = {
-        "messages": history + [new_message],
-        "intent": None,
-        "retrieved_docs": [],
-        "tool_name": None,
-        "tool_args": None,
-        "tool_result": None,
-        "session_id": session_id,
-        "user_id": user_id,
-    }
+    initial_state = create_initial_state(
+        session_id=session_id,
+        user_id=user_id,
+        messages=history + [new_message],
+    )
 
-    logger.debug(f"📜 [StreamWithStatus] 세션 히스토리: {len(history)}개 메시지")
+    logger.debug("📜 [StreamWithStatus] 세션 히스토리: {}개 메시지", len(history))
 
     final_response = ""
     final_tool_name = None
@@ -148,42 +192,50 @@ async def stream_with_status(
     }
 
     # TODO 2: 스트리밍 모드 설정
-    async for mode, event in graph.astream(
-        initial_state, stream_mode=["updates", "messages"]
-    ):  # type: ignore # stream_mode 수정!
-        # TODO 3: 노드 스트리밍 (mode == "updates")
-        if mode == "updates":
-            for node_name, node_output in event.items():
-                # 여기에 구현하세요!
-                if node_name != current_node and node_name in node_status:
-                    current_node = node_name
-                    yield (node_status[node_name], None, None, None)
-                    logger.debug(f"[stream_with_status] 노드 진입: {node_name}")
-
-                if node_name == "tool" and node_output:
-                    final_tool_name = node_output.get("tool_name")
-
-        # TODO 4: 토큰 스트리밍 (mode == "messages")
-        elif mode == "messages":
-            msg, meta = event
-            # 여기에 구현하세요!
-            node_name = meta.get("langgraph_node", "")
-
-            if node_name != "response":
-                continue
-            if isinstance(msg, AIMessageChunk):
-                token = msg.content or ""
-                if token:
-                    final_response += token
-                    yield (None, token, None, None)
+    # 그래프 이벤트는 별도 태스크에서 bounded 큐로 전달 (backpressure)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_MAX)
+    pump = asyncio.create_task(_pump_graph_events(graph, initial_state, queue))
+
+    try:
+        while (item := await queue.get()) is not _STREAM_END:
+            mode, event = item
+
+            # TODO 3: 노드 스트리밍 (mode == "updates")
+            if mode == "updates":
+                for node_name, node_output in event.items():
+                    # 여기에 구현하세요!
+                    if node_name != current_node and node_name in node_status:
+                        current_node = node_name
+                        yield (node_status[node_name], None, None, None)
+                        logger.debug("[stream_with_status] 노드 진입: {}", node_name)
+
+                    if node_name == "tool" and node_output:
+                        final_tool_name = node_output.get("tool_name")
+
+            # TODO 4: 토큰 스트리밍 (mode == "messages")
+            # 라우터 LLM 호출은 TAG_NOSTREAM으로 제외되어 있으므로
+            # 여기 들어오는 토큰(AIMessageChunk)은 모두 response 노드의 것
+            elif mode == "messages":
+                msg, _ = event
+                if isinstance(msg, AIMessageChunk):
+                    token = msg.content or ""
+                    if token:
+                        final_response += token
+                        yield (None, token, None, None)
+
+        # 그래프 실행 오류/수신 지연 중단 시 예외 전파
+        await pump
+    finally:
+        # 소비자가 먼저 종료된 경우(연결 끊김) pump를 취소하고 끝날 때까지 대기
+        pump.cancel()
+        await asyncio.gather(pump, return_exceptions=True)
 
     # 세션 히스토리 저장
     if final_response:
-        if session_id not in SESSION_STORE:
-            SESSION_STORE[session_id] = []
-        SESSION_STORE[session_id].append(new_message)
-        SESSION_STORE[session_id].append(AIMessage(content=final_response))
-        logger.debug(f"💾 [StreamWithStatus] 세션 저장: {session_id}")
+        await session_repo.append(
+            session_id, [new_message, AIMessage(content=final_response)]
+        )
+        logger.debug("💾 [StreamWithStatus] 세션 저장: {}", session_id)
 
     # 마지막에 최종 응답 yield : status, token, final_response, final_tool_name
     yield (None, None, final_response, final_tool_name)
@@ -191,7 +243,7 @@ async def stream_with_status(
 
 # SSE 스트리밍 엔드포인트
 @router.post("/stream")
-async def chat_stream(request: ChatRequest) -> StreamingResponse:
+async def chat_stream(request: ChatRequest, http: Request) -> StreamingResponse:
     """
     SSE 노드 + 토큰 스트리밍 채팅 엔드포인트
 
@@ -199,11 +251,13 @@ async def chat_stream(request: ChatRequest) -> StreamingResponse:
 
     SSE 이벤트 타입:
         - thinking: 노드 진행 상황 ("🔀 루미 생각 중...")
-        - token: LLM 토큰 (글자 단위)
+        - token: LLM 토큰 (여러 토큰을 묶어서 전송)
         - response: 최종 응답
         - error: 에러
         - done: 스트리밍 종료
 
+    클라이언트 연결이 끊기면 그래프 실행(LLM/RAG 호출 포함)을 즉시 취소합니다.
+
     Example:
         ```bash
         curl -N -X POST "http://localhost:8000/api/v1/chat/stream" \\
@@ -213,24 +267,65 @@ async def chat_stream(request: ChatRequest) -> StreamingResponse:
     """
     logger.info(f"📩 [Stream] 스트리밍 요청: session={request.session_id}")
 
-    async def generate() -> AsyncGenerator[str, None]:
-        """SSE 이벤트 생성기 - 노드 상태 + 토큰 스트리밍"""
+    async def generate() -> AsyncGenerator[bytes, None]:
+        """
+        SSE 이벤트 생성기 - 노드 상태 + 토큰 스트리밍
+
+        토큰마다 이벤트를 보내면 ASGI send 호출이 토큰 수만큼 발생하므로,
+        TOKEN_FLUSH_CHARS / TOKEN_FLUSH_INTERVAL 기준으로 묶어서 전송합니다.
+        전송 직전마다 연결 상태를 확인하고, 끊겼으면 stream_with_status를 닫아
+        그래프 실행 태스크를 취소합니다.
+        """
+        buffer: list[str] = []
+        buffered_chars = 0
+        last_flush = time.monotonic()
+
+        def flush() -> bytes:
+            nonlocal buffered_chars, last_flush
+            sse = StreamEvent(type="token", content="".join(buffer)).to_sse()
+            buffer.clear()
+            buffered_chars = 0
+            last_flush = time.monotonic()
+            return sse
+
         try:
-            async for status, token, final, tool_used in stream_with_status(
-                request.message,
-                request.session_id,
-                request.user_id,
-            ):
-                # TODO 5: 이벤트 타입별(thinking, token, response) SSE 전송
-                if status:
-                    yield StreamEvent(type="thinking", content=status).to_sse()
-
-                if token:
-                    yield StreamEvent(type="token", content=token).to_sse()
-                if final:
-                    yield StreamEvent(
-                        type="response", content=final, tool_used=tool_used
-                    ).to_sse()
+            async with aclosing(
+                stream_with_status(
+                    request.message,
+                    request.session_id,
+                    request.user_id,
+                )
+            ) as events:
+                async for status, token, final, tool_used in events:
+                    # TODO 5: 이벤트 타입별(thinking, token, response) SSE 전송
+                    if token:
+                        buffer.append(token)
+                        buffered_chars += len(token)
+                        if (
+                            buffered_chars < TOKEN_FLUSH_CHARS
+                            and time.monotonic() - last_flush < TOKEN_FLUSH_INTERVAL
+                        ):
+                            continue
+
+                    # 전송 직전 연결 확인 (토큰은 묶음 전송 시점에만 확인)
+                    if await http.is_disconnected():
+                        logger.info(
+                            f"🔌 [Stream] 클라이언트 연결 종료: "
+                            f"session={request.session_id}"
+                        )
+                        return
+
+                    if buffer:
+                        yield flush()
+                    if status:
+                        yield StreamEvent(type="thinking", content=status).to_sse()
+                    if final:
+                        yield StreamEvent(
+                            type="response", content=final, tool_used=tool_used
+                        ).to_sse()
+
+            if buffer:
+                yield flush()
 
             # TODO 6: 완료 이벤트 전송
             yield StreamEvent(type="done").to_sse()
@@ -238,6 +333,8 @@ async def chat_stream(request: ChatRequest) -> StreamingResponse:
 
         except Exception as e:
             logger.error(f"❌ [Stream] 오류: {e}")
+            if buffer:
+                yield flush()
             yield StreamEvent(type="error", error=str(e)).to_sse()
             yield StreamEvent(type="done").to_sse()
 
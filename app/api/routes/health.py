@@ -9,26 +9,33 @@ Production 환경에서 필수적인 헬스체크 API입니다.
     GET /health/ready    - 준비 상태 확인 (DB 연결 등)
 """
 
-from datetime import UTC, datetime
-
+import orjson
 from fastapi import APIRouter
+from fastapi.responses import Response
 
 from app.core.config import settings
 
 # TODO 1: APIRouter 인스턴스 생성
 router = APIRouter()
 
+# 헬스체크 응답은 변하지 않으므로 임포트 시점에 한 번만 인코딩
+# (프로브 시각은 로드밸런서/쿠버네티스가 기록하므로 timestamp는 생략)
+_HEALTH_PAYLOAD = orjson.dumps(
+    {
+        "status": "healthy",
+        "service": "lumi-agent",
+        "version": "0.5.0",
+        "environment": settings.environment,
+    }
+)
+
 
 # TODO 2: 헬스체크 엔드포인트 구현
 @router.get("/")
-async def health_check() -> dict:
+async def health_check() -> Response:
     """
     서버 상태 확인 엔드포인트
+
+    미리 인코딩한 고정 바이트를 그대로 반환합니다.
     """
-    return {
-        "status": "healthy",
-        "timestamp": datetime.now(UTC).isoformat(),
-        "service": "lumi-agent",
-        "version": "0.5.0",
-        "environment": settings.environment,
-    }
+    return Response(content=_HEALTH_PAYLOAD, media_type="application/json")
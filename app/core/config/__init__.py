@@ -1,5 +1,6 @@
 import os
 from functools import lru_cache
+from typing import Final
 
 from .base import BaseAppSettings
 from .config_dev import DevSettings
@@ -22,7 +23,8 @@ def get_settings() -> BaseAppSettings:
     return settings_class()
 
 
-settings = get_settings()
+# 설정은 임포트 시점에 한 번만 읽고 이후 변경 불가 (frozen)
+settings: Final[BaseAppSettings] = get_settings()
 
 __all__ = [
     "BaseAppSettings",
@@ -12,13 +12,23 @@ class BaseAppSettings(BaseSettings):
     llm_model: str = "solar-pro2"
     supabase_url: str = ""
     supabase_key: str = ""
+    redis_url: str = ""
     host: str = "0.0.0.0"
     port: int = 8000
+    enable_ui: bool = True
     project_name: str = "prac"
+    session_max: int = 10_000
+    session_ttl: int = 3600
+    max_turns: int = 3
+    sticky_intent_max_chars: int = 8
+    sticky_intent_ttl: int = 60
+    rag_batch_max: int = 16
+    rag_batch_wait_ms: int = 10
 
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
         case_sensitive=False,
         extra="ignore",
+        frozen=True,
     )
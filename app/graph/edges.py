@@ -8,12 +8,19 @@ LangGraph 그래프의 조건부 라우팅 로직
     - route_by_intent: Router 노드 이후 의도에 따른 분기
 """
 
-from typing import Literal
+from typing import Final, Literal
 
 from loguru import logger
 
 from app.graph.state import LumiState
 
+# intent -> 다음 노드 (없는 intent는 "response")
+_INTENT_ROUTES: Final[dict[str | None, Literal["rag", "tool", "response"]]] = {
+    "chat": "response",
+    "rag": "rag",
+    "tool": "tool",
+}
+
 
 def route_by_intent(state: LumiState) -> Literal["rag", "tool", "response"]:
     """
@@ -25,6 +32,7 @@ def route_by_intent(state: LumiState) -> Literal["rag", "tool", "response"]:
     라우팅 규칙:
         - intent == "chat" -> "response" (바로 응답 생성)
         - intent == "rag"  -> "rag" (문서 검색 후 응답)
+          (Router가 미리 검색한 문서가 있으면 -> "response")
         - intent == "tool" -> "tool" (Tool 실행 후 응답)
 
     Args:
@@ -41,11 +49,12 @@ def route_by_intent(state: LumiState) -> Literal["rag", "tool", "response"]:
     """
     intent = state.get("intent", "chat")
 
-    logger.debug(f"🔀 [Edge] 라우팅 결정: intent={intent}")
+    logger.debug("🔀 [Edge] 라우팅 결정: intent={}", intent)
 
     # TODO 1: intent에 따른 라우팅 구현
-    if intent == "rag":
-        return "rag"
-    if intent == "tool":
-        return "tool"
-    return "response"
+    route = _INTENT_ROUTES.get(intent, "response")
+
+    # Router 노드의 선검색 결과가 있으면 rag 노드 생략
+    if route == "rag" and state.get("retrieved_docs"):
+        return "response"
+    return route
@@ -6,10 +6,10 @@ LangGraph 그래프 구성
 그래프 구조:
     Entry -> router -> (조건부) -> rag/tool/response -> response -> END
 
-    1. router: 의도 분류
+    1. router: 의도 분류 (동시에 RAG 선검색)
     2. 조건부 라우팅:
        - chat -> response
-       - rag -> rag -> response
+       - rag -> rag -> response (선검색 결과가 있으면 rag -> response 바로)
        - tool -> tool -> response
     3. response: 최종 응답 생성
     4. END: 그래프 종료
@@ -11,21 +11,30 @@ LangGraph 그래프의 노드(Node) 정의
     4. response_node: 최종 응답 생성
 """
 
+import asyncio
+import hashlib
 import json
-from datetime import datetime
-from typing import Literal
+from datetime import date
+from functools import lru_cache
+from itertools import islice
+from typing import TYPE_CHECKING, Literal
 
+from cachetools import TTLCache
 from langchain_core.messages import AIMessage, HumanMessage
-from langchain_upstage import ChatUpstage
+from langgraph.constants import TAG_NOSTREAM
 from loguru import logger
 from pydantic import BaseModel, Field
 
 from app.core.config import settings
 from app.core.prompts import RAG_RESPONSE_PROMPT, RESPONSE_PROMPT, ROUTER_PROMPT
 from app.graph.state import LumiState
-from app.repositories.rag import get_rag_repository
+from app.repositories.rag import get_rag_batcher
+from app.repositories.session import get_session_repository
 from app.tools.executor import ToolExecutor
 
+if TYPE_CHECKING:
+    from langchain_upstage import ChatUpstage
+
 
 class RouterOutput(BaseModel):
     """
@@ -46,13 +55,20 @@ class RouterOutput(BaseModel):
     )
 
 
-def get_llm() -> ChatUpstage:
+@lru_cache(maxsize=1)
+def get_llm() -> "ChatUpstage":
     """
-    Upstage Solar LLM 클라이언트를 반환합니다.
+    Upstage Solar LLM 클라이언트를 반환합니다 (싱글톤).
+
+    설정값은 모두 settings 싱글톤에서 읽으므로 한 번 만든 클라이언트를
+    재사용하여 요청마다 클라이언트(HTTP 세션 포함)를 새로 만들지 않습니다.
 
     Returns:
         ChatUpstage: Upstage Solar LLM 클라이언트
     """
+    # langchain_upstage는 임포트 비용이 크므로 처음 사용할 때 임포트
+    from langchain_upstage import ChatUpstage
+
     return ChatUpstage(
         api_key=settings.upstage_api_key,
         model=settings.llm_model,
@@ -61,8 +77,100 @@ def get_llm() -> ChatUpstage:
     )
 
 
+@lru_cache(maxsize=1)
+def get_router_llm():
+    """
+    의도 분류용 structured output LLM을 반환합니다 (싱글톤).
+
+    Returns:
+        Runnable: RouterOutput을 반환하는 LLM
+    """
+    return get_llm().with_structured_output(RouterOutput)
+
+
 tool_executor = ToolExecutor()
 
+# 라우터 의도 분류 캐시
+# - 키: (오늘 날짜 + 정규화된 사용자 입력)의 해시
+#   (get_schedule의 날짜 인자가 오늘 날짜 기준으로 계산되므로 날짜를 키에 포함)
+# - 값: router_node 반환 dict (intent, tool_name, tool_args)
+_ROUTER_CACHE: TTLCache[bytes, dict] = TTLCache(maxsize=4096, ttl=3600)
+
+
+def _cache_key(user_input: str, prefix: str = "") -> bytes:
+    """정규화(앞뒤 공백 제거 + 소문자)한 입력의 blake2s 해시를 캐시 키로 사용합니다."""
+    normalized = user_input.strip().lower()
+    return hashlib.blake2s(f"{prefix}\n{normalized}".encode(), digest_size=16).digest()
+
+
+# 직전 턴이 chat일 때 LLM 없이 chat을 유지할 짧은 맞장구/감사 표현
+# (짧더라도 "일정 알려줘" 같은 요청은 여기에 없으므로 LLM으로 분류)
+_ACK_MESSAGES = frozenset(
+    "ㅇㅇ ㅇㅋ 응 웅 어 엉 네 넹 예 그래 그치 맞아 오케이 ok okay "
+    "고마워 고맙다 감사 감사해 감사합니다 땡큐 헐 대박 와 우와 좋아 좋다".split()
+)
+
+
+def _is_acknowledgement(user_input: str) -> bool:
+    """
+    짧은 맞장구/감사 표현("ㅇㅇ", "고마워", "ㅋㅋ")인지 확인합니다.
+
+    공백과 끝의 문장부호/물결(~)은 무시하고, ㅋ/ㅎ로만 된 웃음도 포함합니다.
+    """
+    normalized = "".join(user_input.split()).rstrip("~!?.,^").lower()
+    if not normalized or len(normalized) > settings.sticky_intent_max_chars:
+        return False
+    return normalized in _ACK_MESSAGES or set(normalized) <= {"ㅋ", "ㅎ"}
+
+
+@lru_cache(maxsize=1)
+def _prefetch_enabled() -> bool:
+    """
+    RAG 선검색 사용 가능 여부 (RAG 묶음 처리기를 만들 수 있는지 한 번만 확인)
+
+    Supabase/Upstage 설정이 없어 만들 수 없으면 메시지마다 RAGRepository
+    생성을 다시 시도하지 않도록 선검색을 끕니다.
+    """
+    try:
+        get_rag_batcher()
+    except Exception as e:
+        logger.warning(f"🔀 [Router] RAG 선검색 비활성화: {e}")
+        return False
+    return True
+
+
+def _consume_prefetch_error(task: asyncio.Task) -> None:
+    """취소 전에 실패한 선검색의 예외를 가져와 'never retrieved' 경고를 막습니다."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.debug("🔀 [Router] RAG 선검색 실패: {}", task.exception())
+
+
+def _start_prefetch(user_input: str) -> asyncio.Task | None:
+    """RAG 선검색 태스크를 시작합니다. (사용할 수 없으면 None)"""
+    if not _prefetch_enabled():
+        return None
+    prefetch = asyncio.create_task(_retrieve_docs(user_input))
+    prefetch.add_done_callback(_consume_prefetch_error)
+    return prefetch
+
+
+async def _remember_intent(session_id: str, intent: str) -> None:
+    """
+    세션의 마지막 의도를 저장합니다.
+
+    저장 실패(Redis 장애 등)는 분류 결과에 영향을 주지 않도록 로그만 남깁니다.
+    """
+    try:
+        await get_session_repository().set_last_intent(session_id, intent)
+    except Exception as e:
+        logger.warning(f"🔀 [Router] 마지막 의도 저장 실패: {e}")
+
+
+@lru_cache(maxsize=2)
+def _router_system(today: str) -> HumanMessage:
+    """날짜가 포함된 라우터 프롬프트 메시지 (날짜별로 한 번만 생성)"""
+    return HumanMessage(content=f"오늘 날짜: {today}\n\n{ROUTER_PROMPT}")
+
 
 # ============================================================
 # 🔀 Router Node: 사용자 의도 분류
@@ -73,6 +181,7 @@ async def router_node(state: LumiState) -> dict:
 
     사용자의 마지막 메시지를 분석하여 의도를 분류합니다.
     with_structured_output()을 사용하여 JSON 파싱 없이 바로 Pydantic 모델로 받습니다.
+    같은 입력(캐시)이나 chat 직후의 짧은 맞장구는 LLM 호출 없이 분류합니다.
 
     분류 결과:
         - chat: 일반 대화 -> 바로 response 노드로
@@ -93,34 +202,70 @@ async def router_node(state: LumiState) -> dict:
     # TODO 1: 마지막 사용자 메시지 추출
     last_message = state["messages"][-1]
     user_input = getattr(last_message, "content", str(last_message))
-    logger.debug(f"사용자 입력: {user_input}")
+    logger.debug("사용자 입력: {}", user_input)
+
+    # 현재 날짜 정보 추가 (스케줄 조회 시 필요)
+    current_date = date.today().isoformat()
+
+    # 같은 날 같은 입력이면 LLM 호출 없이 캐시된 분류 결과 사용
+    cache_key = _cache_key(user_input, prefix=current_date)
+    session_repo = get_session_repository()
+    session_id = state["session_id"]
+
+    cached = _ROUTER_CACHE.get(cache_key)
+    if cached is not None:
+        logger.info(f"🔀 [Router] 캐시 적중: {cached['intent']}")
+        await _remember_intent(session_id, cached["intent"])
+        return dict(cached)
+
+    # 직전 턴이 chat이고 짧은 맞장구("ㅇㅇ", "고마워")면 LLM 호출 없이 chat 유지
+    if (
+        _is_acknowledgement(user_input)
+        and await session_repo.get_last_intent(session_id) == "chat"
+    ):
+        logger.info("🔀 [Router] 짧은 후속 메시지: 이전 의도(chat) 유지")
+        await _remember_intent(session_id, "chat")
+        return {
+            "intent": "chat",
+            "tool_name": None,
+            "tool_args": None,
+        }
 
     # TODO 2: LLM에 with_structured_output 적용
-    llm = get_llm()
-    structured_llm = llm.with_structured_output(RouterOutput)
+    structured_llm = get_router_llm()
 
-    # 현재 날짜 정보 추가 (스케줄 조회 시 필요)
-    current_date = datetime.now().strftime("%Y-%m-%d")
+    # 의도 분류와 동시에 RAG 검색을 미리 시작 (intent가 rag가 아니면 취소)
+    prefetch = _start_prefetch(user_input)
 
     messages = [
-        HumanMessage(content=f"오늘 날짜: {current_date}\n\n{ROUTER_PROMPT}"),
+        _router_system(current_date),
         HumanMessage(content=f"사용자: {user_input}"),
     ]
 
     try:
         # TODO 3: structured_llm으로 의도 분류
-        result = await structured_llm.ainvoke(messages)
+        # TAG_NOSTREAM: 라우터 토큰은 stream_mode="messages"로 내보내지 않음
+        # (토큰 스트리밍은 response 노드만 사용)
+        result = await structured_llm.ainvoke(messages, config={"tags": [TAG_NOSTREAM]})
 
         logger.info(f"🔀 [Router] 의도: {result.intent}, Tool: {result.tool_name}")
 
-        # TODO 4: 분류 결과 반환
-        return {
+        # TODO 4: 분류 결과 반환 (오류 시 기본값은 캐시하지 않음)
+        output = {
             "intent": result.intent,
             "tool_name": result.tool_name,
             "tool_args": result.tool_args,
         }
+        _ROUTER_CACHE[cache_key] = output
 
+    except asyncio.CancelledError:
+        # 요청이 취소되면(연결 종료 등) 선검색도 함께 취소
+        if prefetch is not None:
+            prefetch.cancel()
+        raise
     except Exception as e:
+        if prefetch is not None:
+            prefetch.cancel()
         logger.warning(f"Router 노드 오류: {e}, 기본값(chat)으로 설정")
         return {
             "intent": "chat",
@@ -128,10 +273,61 @@ async def router_node(state: LumiState) -> dict:
             "tool_args": None,
         }
 
+    await _remember_intent(session_id, output["intent"])
+
+    if output["intent"] != "rag":
+        if prefetch is not None:
+            prefetch.cancel()
+        return dict(output)
+
+    # 선검색을 사용할 수 없으면 rag 노드에서 검색
+    if prefetch is None:
+        return dict(output)
+
+    # intent가 rag이면 미리 검색한 문서를 함께 반환 -> rag 노드 생략
+    try:
+        retrieved_docs = await prefetch
+    except Exception as e:
+        logger.warning(f"🔀 [Router] RAG 선검색 실패: {e}, rag 노드에서 재시도")
+        return dict(output)
+
+    return {**output, "retrieved_docs": retrieved_docs}
+
 
 # ============================================================
 # 📚 RAG Node: 문서 검색
 # ============================================================
+async def _retrieve_docs(user_input: str) -> list[str]:
+    """
+    사용자 입력으로 관련 문서를 검색하여 content 목록을 반환합니다.
+
+    동시 요청을 묶어서 검색합니다. (k=3, 활성 문서만, 같은 입력의 검색 결과는
+    RAGRepository의 결과 캐시에서 재사용) 검색 중 예외는 호출자에게 전파됩니다.
+    """
+    # TODO 5: RAG 검색 실행
+    # 동시 요청을 묶어서 검색 (k=3, 활성 문서만)
+    docs = await get_rag_batcher().submit(user_input)
+
+    # TODO 6: 검색 결과에서 content만 추출
+    retrieved_docs = [doc.get("content", "") for doc in docs if doc.get("content")]
+
+    # 검색 결과 로깅 (디버깅용, DEBUG 로그가 켜져 있을 때만 목록 생성)
+    logger.opt(lazy=True).debug(
+        "📚 [RAG] 검색 상세 (version, similarity, content): {}",
+        lambda: [
+            (
+                doc.get("metadata", {}).get("version", "?"),
+                round(doc.get("similarity", 0), 3),
+                doc.get("content", "")[:50],
+            )
+            for doc in docs
+        ],
+    )
+
+    logger.info(f"📚 [RAG] 검색 완료: {len(retrieved_docs)}개 문서")
+    return retrieved_docs
+
+
 async def rag_node(state: LumiState) -> dict:
     """
     📚 RAG 노드: 관련 문서 검색
@@ -153,28 +349,7 @@ async def rag_node(state: LumiState) -> dict:
     user_input = last_message.content
 
     try:
-        # RAG Repository로 실제 검색
-        rag_repo = get_rag_repository()
-
-        # TODO 5: RAG 검색 실행
-        docs = await rag_repo.search_similar(
-            user_input,
-            k=3,
-            filter_status="active",
-        )
-
-        # TODO 6: 검색 결과에서 content만 추출
-        retrieved_docs = [doc.get("content", "") for doc in docs if doc.get("content")]
-
-        # 검색 결과 로깅 (디버깅용)
-        for i, doc in enumerate(docs):
-            version = doc.get("metadata", {}).get("version", "?")
-            similarity = doc.get("similarity", 0)
-            logger.debug(
-                f"  [{i + 1}] v{version} (sim: {similarity:.3f}): {doc['content'][:50]}..."
-            )
-
-        logger.info(f"📚 [RAG] 검색 완료: {len(retrieved_docs)}개 문서")
+        retrieved_docs = await _retrieve_docs(user_input)
 
     except Exception as e:
         logger.error(f"📚 [RAG] 검색 실패: {e}")
@@ -274,9 +449,10 @@ async def response_node(state: LumiState) -> dict:
         tool_result = state["tool_result"]
 
         # Tool 결과를 자연스러운 응답으로 변환하기 위한 컨텍스트
+        # (들여쓰기/공백 없는 compact JSON: 프롬프트 토큰 절약)
         result_context = f"""
 ## 📋 조회 결과 (내부 참고용, 절대 그대로 출력하지 마!)
-{json.dumps(tool_result, ensure_ascii=False, indent=2)}
+{json.dumps(tool_result, ensure_ascii=False, separators=(",", ":"))}
 
 ## 규칙
 - 위 결과를 바탕으로 루미답게 친근하게 안내해줘
@@ -291,19 +467,22 @@ async def response_node(state: LumiState) -> dict:
         system_prompt = RESPONSE_PROMPT
 
     # 대화 히스토리를 LLM에 전달하여 과거 질문 기억
-    # 최근 6개 메시지 (3턴: user+ai 쌍)를 히스토리로 포함
-    # 마지막 메시지(현재 질문)는 별도로 추가하므로 제외
-    history_messages = state["messages"][:-1][-6:] if len(state["messages"]) > 1 else []
+    # 최근 settings.max_turns턴만 사용 (세션 저장소를 거치지 않은 호출도 제한)
+    # 마지막 메시지(현재 질문)는 별도로 추가하므로 제외, 리스트 복사 없이 순회
+    all_messages = state["messages"]
+    end = len(all_messages) - 1
+    start = max(0, end - 2 * settings.max_turns)
+    history_messages = islice(all_messages, start, end)
 
     # 히스토리를 텍스트로 변환
-    history_text = ""
-    if history_messages:
-        history_parts = []
-        for msg in history_messages:
-            role = "사용자" if isinstance(msg, HumanMessage) else "루미"
-            history_parts.append(f"{role}: {msg.content}")
-        history_text = "\n".join(history_parts)
-        history_text = f"\n\n## 이전 대화:\n{history_text}\n"
+    if end > start:
+        history_parts = [
+            f"{'사용자' if isinstance(msg, HumanMessage) else '루미'}: {msg.content}"
+            for msg in history_messages
+        ]
+        history_text = "\n\n## 이전 대화:\n" + "\n".join(history_parts) + "\n"
+    else:
+        history_text = ""
 
     # LLM 호출 (히스토리 포함)
     messages = [
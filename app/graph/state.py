@@ -10,7 +10,7 @@ TypedDict를 사용하여 타입 안전하게 정의합니다.
     - Annotated[list, add_messages]를 사용하면 메시지가 자동으로 추가됨
 """
 
-from typing import Annotated, Any, Literal, TypedDict
+from typing import Annotated, Any, Literal, TypedDict, cast
 
 from langchain_core.messages import BaseMessage
 from langgraph.graph.message import add_messages
@@ -60,6 +60,12 @@ class LumiState(TypedDict):
     user_id: str | None
 
 
+# create_initial_state 템플릿 (불변 값만 보관)
+_INITIAL_STATE: dict[str, Any] = dict.fromkeys(
+    ("intent", "tool_name", "tool_args", "tool_result")
+)
+
+
 def create_initial_state(
     session_id: str,
     user_id: str | None = None,
@@ -81,13 +87,15 @@ def create_initial_state(
         >>> print(state["session_id"])
         'session-123'
     """
-    return LumiState(
-        messages=messages or [],
-        intent=None,
-        retrieved_docs=[],
-        tool_name=None,
-        tool_args=None,
-        tool_result=None,
-        session_id=session_id,
-        user_id=user_id,
+    # None 필드는 템플릿에서 복사하고, 리스트는 상태마다 새로 생성 (공유 X)
+    # (템플릿은 dict[str, Any]이므로 TypedDict로 cast)
+    return cast(
+        LumiState,
+        {
+            **_INITIAL_STATE,
+            "messages": messages or [],
+            "retrieved_docs": [],
+            "session_id": session_id,
+            "user_id": user_id,
+        },
     )
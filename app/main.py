@@ -1,20 +1,47 @@
+import asyncio
+import atexit
+import logging
+import queue
 import sys
 from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
 
-import gradio as gr
+import orjson
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, Response
 from loguru import logger
 
 from app.api.routes import api_router
 from app.core.config import settings
-from app.ui import create_demo
+from app.graph import get_lumi_graph
+from app.graph.nodes import get_llm, get_router_llm
+from app.repositories.rag import get_rag_repository
 
 # 1. 로거 설정
+# 요청 처리(이벤트 루프)에서는 큐에 넣기만 하고, stdout 쓰기는 QueueListener 스레드가 담당합니다.
+# 큐가 가득 차면(LOG_QUEUE_MAX) 새 로그는 버려서 메모리가 무한히 늘지 않도록 합니다.
+LOG_QUEUE_MAX = 10_000
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """큐가 가득 차면 로그를 버리는 QueueHandler"""
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+_log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_MAX)
+_log_listener = QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logger.remove()
 logger.add(
-    sys.stdout,
+    _DroppingQueueHandler(_log_queue),
     # 로깅 메시지의 형식을 지정합니다. 시간, 로그 레벨, 모듈 이름, 함수 이름, 라인 번호, 그리고 실제 메시지를 포함하도록 설정되어 있습니다.
     format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
     level="DEBUG" if settings.debug else "INFO",
@@ -33,11 +60,18 @@ async def lifespan(app: FastAPI):
     logger.info("=" * 50)
 
     _validate_settings()
+    _warm_up()
+    await _warm_up_connections()
 
     yield  # 이 지점에서 서버가 요청을 처리함
 
     logger.info("Lumi Agent 서버를 종료합니다...")
 
+    if settings.enable_ui:
+        from app.ui import close_http_client
+
+        await close_http_client()
+
 
 # 6. 설정 검증 함수
 def _validate_settings():
@@ -51,6 +85,66 @@ def _validate_settings():
         logger.warning("Production 환경에서 DEBUG 모드가 활성화되어 있습니다!")
 
 
+# 6.1 싱글톤 워밍업 함수
+def _warm_up():
+    """그래프 컴파일과 LLM/RAG 클라이언트 생성을 서버 시작 시점에 미리 수행합니다.
+
+    첫 요청이 초기화 비용을 떠안지 않도록 하며, 실패해도 서버 시작은 계속됩니다.
+    (실패한 항목은 첫 요청 시 다시 초기화를 시도합니다.)
+    """
+    get_lumi_graph()
+
+    if settings.upstage_api_key:
+        try:
+            get_router_llm()
+            get_llm()
+        except Exception as e:
+            logger.warning(f"LLM 클라이언트 워밍업 실패: {e}")
+
+    try:
+        get_rag_repository()
+    except Exception as e:
+        logger.warning(f"RAG Repository 워밍업 실패: {e}")
+
+
+# 6.2 외부 연결 워밍업 함수
+WARM_UP_TIMEOUT = 5.0  # 초
+
+
+async def _warm_up_connections():
+    """임베딩 API와 Supabase에 가벼운 요청을 한 번씩 보내 연결(TLS 핸드셰이크)을 미리 맺어 둡니다.
+
+    첫 사용자 요청이 연결 수립 지연을 떠안지 않도록 하며,
+    실패하거나 WARM_UP_TIMEOUT초를 넘겨도 서버 시작은 계속됩니다.
+    """
+    if not settings.upstage_api_key:
+        return
+
+    try:
+        repo = get_rag_repository()
+    except Exception:
+        return  # _warm_up에서 이미 경고를 남김
+
+    async def warm_embeddings():
+        await repo.embeddings.aembed_query("warmup")
+
+    async def warm_supabase():
+        # Supabase 클라이언트는 동기 호출이므로 스레드에서 실행
+        query = repo.supabase.table("documents").select("id").limit(1)
+        await asyncio.to_thread(query.execute)
+
+    targets = {"임베딩 API": warm_embeddings, "Supabase": warm_supabase}
+    results = await asyncio.gather(
+        *(asyncio.wait_for(warm(), WARM_UP_TIMEOUT) for warm in targets.values()),
+        return_exceptions=True,
+    )
+    for name, result in zip(targets, results, strict=True):
+        if isinstance(result, BaseException):
+            logger.warning(f"{name} 연결 워밍업 실패: {result!r}")
+        else:
+            logger.info(f"✅ {name} 연결 워밍업 완료")
+
+
 # 2. FastAPI 애플리케이션 생성
 app = FastAPI(
     title=settings.project_name,
@@ -78,21 +172,19 @@ app.include_router(api_router, prefix="/api/v1")
 # 8. endpoint 생성
 @app.get("/", tags=["Root"])
 async def root() -> RedirectResponse:
-    return RedirectResponse(url="/ui")
+    return RedirectResponse(url="/ui" if settings.enable_ui else "/docs")
 
 
 # 8.1 헬스 체크 및 서버 정보 endpoint 생성
-@app.get("/health", tags=["System"])
-async def health_check() -> dict:
-    return {
+# 응답 내용이 설정값(frozen)뿐이므로 임포트 시점에 한 번만 JSON으로 인코딩
+_HEALTH_PAYLOAD = orjson.dumps(
+    {
         "status": "ok",
         "environment": settings.environment,
     }
-
-
-@app.get("/info", tags=["System"])
-async def server_info() -> dict:
-    return {
+)
+_INFO_PAYLOAD = orjson.dumps(
+    {
         "project_name": settings.project_name,
         "environment": settings.environment,
         "debug": settings.debug,
@@ -100,18 +192,60 @@ async def server_info() -> dict:
         "port": settings.port,
         "version": app.version,
     }
+)
 
 
-app = gr.mount_gradio_app(app, create_demo(), path="/ui")
+@app.get("/health", tags=["System"])
+async def health_check() -> Response:
+    return Response(content=_HEALTH_PAYLOAD, media_type="application/json")
+
+
+@app.get("/info", tags=["System"])
+async def server_info() -> Response:
+    return Response(content=_INFO_PAYLOAD, media_type="application/json")
+
+
+# 8.2 Gradio UI 마운트
+# ENABLE_UI=false인 API 전용 워커는 gradio를 임포트하지 않아 메모리/기동 시간을 절약합니다.
+if settings.enable_ui:
+    import gradio as gr
+
+    from app.ui import CUSTOM_CSS_BYTES, create_demo
+
+    @app.get("/static/lumi.css", include_in_schema=False)
+    async def lumi_css() -> Response:
+        # URL에 내용 해시(v=)가 붙으므로 장기 캐시 가능
+        return Response(
+            CUSTOM_CSS_BYTES,
+            media_type="text/css",
+            headers={"Cache-Control": "public, max-age=31536000, immutable"},
+        )
+
+    app = gr.mount_gradio_app(app, create_demo(), path="/ui")
 
 
 # 9. 실행 함수
+# - 개발(DEBUG): 자동 리로드, 단일 워커
+# - 운영: CPU 수만큼 워커 (최소 2개)
+#   세션 히스토리는 Redis로만 워커 간에 공유되므로 REDIS_URL이 없으면 단일 워커로 실행
+# gunicorn 대안 (preload로 워커 간 메모리 공유):
+#   gunicorn app.main:app -k uvicorn.workers.UvicornWorker --preload -w N
 if __name__ == "__main__":
+    import os
+
     import uvicorn
 
+    # 세션을 공유할 Redis가 없거나 Gradio UI를 마운트하면 단일 워커로 실행
+    # (Gradio 큐/이벤트 상태는 프로세스 메모리에 있어 워커 간에 공유되지 않음)
+    if settings.debug or not settings.redis_url or settings.enable_ui:
+        workers = 1
+    else:
+        workers = max(2, os.cpu_count() or 1)
+
     uvicorn.run(
         "app.main:app",
         host=settings.host,
         port=settings.port,
         reload=settings.debug,
+        workers=workers,
     )
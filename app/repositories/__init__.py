@@ -12,8 +12,11 @@ Repository 패턴을 사용하는 이유:
     - fan_letter.py: 팬레터 Repository
     - rag.py: RAG Repository
     - schedule.py: 스케줄 Repository
+    - session.py: 대화 세션 Repository
 """
 
+from functools import lru_cache
+
 from loguru import logger
 
 from app.core.config import settings
@@ -21,6 +24,17 @@ from app.core.config import settings
 # Supabase 클라이언트 싱글톤
 _supabase_client = None
 
+# Supabase(PostgREST/Auth/Storage) 공용 httpx 커넥션 풀 설정
+SUPABASE_MAX_CONNECTIONS = 20
+SUPABASE_MAX_KEEPALIVE = 10
+SUPABASE_KEEPALIVE_EXPIRY = 30.0
+SUPABASE_TIMEOUT = 5.0
+SUPABASE_CONNECT_TIMEOUT = 2.0
+SUPABASE_CONNECT_RETRIES = 2
+
+# Redis 클라이언트 싱글톤
+_redis_client = None
+
 
 def get_supabase_client():
     """
@@ -33,11 +47,31 @@ def get_supabase_client():
 
     if _supabase_client is None and settings.supabase_url and settings.supabase_key:
         try:
-            from supabase import create_client
+            import httpx
+            from supabase import ClientOptions, create_client
 
+            # 기본 httpx 클라이언트 대신 풀 크기/타임아웃/연결 재시도를 명시한 클라이언트 사용
+            # (retries는 연결 실패(ConnectError/ConnectTimeout)에만 적용)
+            # (transport를 직접 넘기면 Client의 limits는 무시되므로 transport에 설정)
+            http_client = httpx.Client(
+                follow_redirects=True,
+                timeout=httpx.Timeout(
+                    SUPABASE_TIMEOUT, connect=SUPABASE_CONNECT_TIMEOUT
+                ),
+                transport=httpx.HTTPTransport(
+                    http2=True,
+                    retries=SUPABASE_CONNECT_RETRIES,
+                    limits=httpx.Limits(
+                        max_connections=SUPABASE_MAX_CONNECTIONS,
+                        max_keepalive_connections=SUPABASE_MAX_KEEPALIVE,
+                        keepalive_expiry=SUPABASE_KEEPALIVE_EXPIRY,
+                    ),
+                ),
+            )
             _supabase_client = create_client(
                 settings.supabase_url,
                 settings.supabase_key,
+                options=ClientOptions(httpx_client=http_client),
             )
             logger.info("✅ Supabase 클라이언트 초기화 완료")
         except Exception as e:
@@ -45,3 +79,45 @@ def get_supabase_client():
             _supabase_client = None
 
     return _supabase_client
+
+
+@lru_cache(maxsize=1)
+def upstream_errors() -> tuple[type[Exception], ...]:
+    """
+    Supabase/임베딩 API 호출에서 예상되는 장애 예외 타입을 반환합니다.
+
+    `except upstream_errors():` 형태로 사용합니다. except 절의 식은 예외가 발생했을 때만
+    평가되므로 정상 경로에서는 httpx/postgrest/openai를 임포트하지 않습니다.
+    여기에 없는 예외(버그)는 잡지 않고 호출자(노드의 폴백, FastAPI 핸들러)로 전파합니다.
+
+    Returns:
+        tuple: (httpx.HTTPError, postgrest APIError, openai.APIError, TimeoutError)
+    """
+    import httpx
+    import openai
+    from postgrest.exceptions import APIError
+
+    return (httpx.HTTPError, APIError, openai.APIError, TimeoutError)
+
+
+def get_redis_client():
+    """
+    Redis 비동기 클라이언트를 반환합니다 (싱글톤 패턴).
+
+    설정(settings)에 REDIS_URL이 있을 때만 클라이언트를 생성합니다.
+    redis.asyncio 클라이언트는 첫 명령 실행 시 연결하므로 여기서는 네트워크 I/O가 없습니다.
+    생성 실패 시 None을 반환합니다.
+    """
+    global _redis_client
+
+    if _redis_client is None and settings.redis_url:
+        try:
+            from redis.asyncio import from_url
+
+            _redis_client = from_url(settings.redis_url)
+            logger.info("✅ Redis 클라이언트 초기화 완료")
+        except Exception as e:
+            logger.warning(f"Redis 초기화 실패: {e}")
+            _redis_client = None
+
+    return _redis_client
@@ -73,3 +73,24 @@ class FanLetterRepository:
         except Exception as e:
             logger.error(f"Supabase 저장 오류: {e}")
             return ""
+
+
+# 싱글톤 인스턴스
+_fan_letter_repository: FanLetterRepository | None = None
+
+
+def get_fan_letter_repository() -> FanLetterRepository:
+    """
+    FanLetterRepository 싱글톤 인스턴스를 반환합니다.
+
+    Supabase 클라이언트 없이 만들어진 경우에는 다음 호출 시 다시 생성합니다.
+
+    Returns:
+        FanLetterRepository: 팬레터 Repository 인스턴스
+    """
+    global _fan_letter_repository
+
+    if _fan_letter_repository is None or _fan_letter_repository.client is None:
+        _fan_letter_repository = FanLetterRepository()
+
+    return _fan_letter_repository
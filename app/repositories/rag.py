@@ -11,16 +11,32 @@ RAG(Retrieval-Augmented Generation)를 위한 문서 검색 Repository
 
     # 모든 문서 검색 (테스트용)
     docs = await repo.search_similar("마늘 좋아해?", filter_status="all")
+
+    # 동시 요청 묶음 검색 (임베딩 호출 1회로 여러 쿼리 처리)
+    docs = await get_rag_batcher().submit("루미 MBTI")
 """
 
-from typing import Literal
+import asyncio
+import hashlib
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Literal, cast
 
-from langchain_upstage import UpstageEmbeddings
+from cachetools import TTLCache
 from loguru import logger
-from supabase import Client, create_client
 
 from app.core.config import settings
 
+from . import get_supabase_client, upstream_errors
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+
+def _embedding_key(query: str) -> bytes:
+    """정규화(앞뒤 공백 제거 + 소문자)한 쿼리의 blake2s 해시를 임베딩 캐시 키로 사용합니다."""
+    normalized = query.strip().lower()
+    return hashlib.blake2s(normalized.encode(), digest_size=16).digest()
+
 
 class RAGRepository:
     """
@@ -33,6 +49,12 @@ class RAGRepository:
     - filter_status="deprecated": 폐기 문서만 검색 (디버깅용)
     - filter_status="all": 모든 문서 검색 (테스트용)
 
+    같은 쿼리의 임베딩은 캐시(최대 4096개, 1시간)에서 재사용하여
+    Upstage 임베딩 API 호출을 생략합니다. 같은 쿼리의 임베딩 요청이 이미
+    진행 중이면 새로 호출하지 않고 그 결과를 함께 기다립니다.
+    같은 (쿼리, k, filter_status)의 검색 결과는 캐시(최대 2048개, 5분)에서
+    재사용하여 임베딩 호출과 RPC를 모두 생략합니다.
+
     Attributes:
         embeddings: Upstage 임베딩 클라이언트
         supabase: Supabase 클라이언트
@@ -42,21 +64,141 @@ class RAGRepository:
         """
         RAGRepository 초기화
         """
+        # langchain_upstage는 임포트 비용이 크므로 Repository 생성 시 임포트
+        from langchain_upstage import UpstageEmbeddings
+
         self.embeddings = UpstageEmbeddings(
             api_key=settings.upstage_api_key, model="solar-embedding-1-large-passage"
         )
 
-        self.supabase: Client = create_client(
-            settings.supabase_url, settings.supabase_key
+        # 다른 Repository와 같은 Supabase 클라이언트(HTTP 세션) 공유
+        self.supabase: Client = get_supabase_client()
+        if self.supabase is None:
+            raise ValueError(
+                "Supabase 클라이언트를 초기화할 수 없습니다. "
+                "SUPABASE_URL/SUPABASE_KEY를 확인하세요."
+            )
+
+        self._embedding_cache: TTLCache[bytes, list[float]] = TTLCache(
+            maxsize=4096, ttl=3600
+        )
+        self._inflight: dict[bytes, asyncio.Future] = {}
+        self._result_cache: TTLCache[tuple[bytes, int, str], list[dict]] = TTLCache(
+            maxsize=2048, ttl=300
         )
 
         logger.info("RAGRepository 초기화 완료 (필터링 지원)")
 
+    def _resolve_inflight(
+        self,
+        futures: dict[bytes, asyncio.Future],
+        embeddings: dict[bytes, list[float]],
+    ) -> None:
+        """
+        진행 중인 임베딩 요청을 기다리는 호출자들에게 결과를 전달하고
+        등록을 해제합니다.
+        """
+        for key, future in futures.items():
+            self._inflight.pop(key, None)
+            future.set_result(embeddings[key])
+
+    def _fail_inflight(
+        self, futures: dict[bytes, asyncio.Future], error: BaseException
+    ) -> None:
+        """
+        진행 중인 임베딩 요청을 기다리는 호출자들에게 오류를 전달하고
+        등록을 해제합니다.
+        """
+        if isinstance(error, asyncio.CancelledError):
+            error = RuntimeError("임베딩 요청이 취소되었습니다.")
+
+        for key, future in futures.items():
+            self._inflight.pop(key, None)
+            future.set_exception(error)
+            future.exception()  # 기다리는 호출자가 없어도 경고가 나지 않도록
+
+    async def _aembed_queries(self, texts: list[str]) -> list[list[float]]:
+        """
+        여러 쿼리를 query 임베딩 모델로 한 번에 임베딩합니다.
+
+        UpstageEmbeddings.aembed_documents는 passage 모델을 사용하고 aembed_query는
+        한 건씩만 받으므로, aembed_query와 같은 방식(비공개 _invocation_params에
+        "-query" 접미사)으로 클라이언트를 직접 호출합니다. langchain_upstage의
+        내부 구현에 의존하는 부분은 이 메서드에만 둡니다.
+        응답 순서는 보장되지 않으므로 index 기준으로 정렬해 texts 순서에 맞춥니다.
+
+        Raises:
+            ValueError: 응답 임베딩 수가 texts 수와 다른 경우
+        """
+        params = self.embeddings._invocation_params
+        params["model"] = params["model"] + "-query"
+        response = await self.embeddings.async_client.create(input=texts, **params)
+        if len(response.data) != len(texts):
+            raise ValueError(
+                f"임베딩 응답 수({len(response.data)})가 요청 수({len(texts)})와 다릅니다."
+            )
+        return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+
+    async def _embed_with_cache(self, query: str) -> list[float]:
+        """
+        쿼리 임베딩을 반환합니다. (캐시 미스 시에만 임베딩 API 호출)
+
+        같은 쿼리의 요청이 진행 중이면 그 결과를 함께 기다립니다.
+
+        Args:
+            query: 검색 쿼리
+
+        Returns:
+            list[float]: 쿼리 임베딩
+        """
+        key = _embedding_key(query)
+        embedding = self._embedding_cache.get(key)
+        if embedding is not None:
+            return embedding
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            embedding = await self.embeddings.aembed_query(query)
+        except BaseException as e:
+            self._fail_inflight({key: future}, e)
+            raise
+
+        self._embedding_cache[key] = embedding
+        self._resolve_inflight({key: future}, {key: embedding})
+        return embedding
+
+    async def _match_documents(
+        self, embedding: list[float], k: int, filter_status: str
+    ) -> list[dict]:
+        """
+        match_documents RPC를 실행합니다.
+
+        Supabase 클라이언트는 동기 방식이므로 스레드에서 실행하여
+        RPC를 기다리는 동안 이벤트 루프를 막지 않습니다.
+        """
+        request = self.supabase.rpc(
+            "match_documents",
+            {
+                "query_embedding": embedding,
+                "match_count": k,
+                "filter_status": filter_status,
+            },
+        )
+        result = await asyncio.to_thread(request.execute)
+        # match_documents는 문서 행 목록을 반환 (postgrest는 JSON으로만 타입 지정)
+        return cast(list[dict], result.data or [])
+
     async def search_similar(
         self,
         query: str,
         k: int = 3,
         filter_status: Literal["active", "deprecated", "all"] = "active",
+        no_cache: bool = False,
     ) -> list[dict]:
         """
         쿼리와 유사한 문서를 검색합니다.
@@ -69,6 +211,7 @@ class RAGRepository:
             query: 검색 쿼리
             k: 반환할 문서 수 (기본값: 3)
             filter_status: 필터링 조건 (기본값: "active")
+            no_cache: True면 결과 캐시를 사용하지 않음 (기본값: False)
 
         Returns:
             list[dict]: 검색된 문서 목록
@@ -87,40 +230,151 @@ class RAGRepository:
             >>> docs = await repo.search_similar("마늘 좋아해?", filter_status="all")
             >>> # 결과: v1.0 "뱀파이어라 마늘 싫어함"도 포함될 수 있음!
         """
-        logger.info(f"RAG 검색: '{query[:30]}...' (k={k}, filter={filter_status})")
+        cache_key = (_embedding_key(query), k, filter_status)
+        cached = None if no_cache else self._result_cache.get(cache_key)
+        logger.info(
+            f"RAG 검색: '{query[:30]}...' (k={k}, filter={filter_status}, "
+            f"cache={'hit' if cached is not None else 'miss'})"
+        )
+        if cached is not None:
+            return cached
 
         try:
-            # Step 1: 쿼리 임베딩
-            query_embedding = await self.embeddings.aembed_query(query)
-
-            # Step 2: Supabase RPC로 유사 문서 검색
-            # filter_status 파라미터 추가
-            result = self.supabase.rpc(
-                "match_documents",
-                {
-                    "query_embedding": query_embedding,
-                    "match_count": k,
-                    "filter_status": filter_status,  # 필터링!
-                },
-            ).execute()
-
-            docs = result.data or []
-
-            # 결과 로깅 (디버깅용)
-            for doc in docs:
-                version = doc.get("metadata", {}).get("version", "?")
-                status = doc.get("metadata", {}).get("status", "?")
-                similarity = doc.get("similarity", 0)
-                logger.debug(f"  - v{version} ({status}): {similarity:.3f}")
+            # Step 1: 쿼리 임베딩 (캐시 우선)
+            query_embedding = await self._embed_with_cache(query)
+
+            # Step 2: Supabase RPC로 유사 문서 검색 (filter_status로 필터링)
+            docs = await self._match_documents(query_embedding, k, filter_status)
+
+            # 결과 로깅 (디버깅용, DEBUG 로그가 켜져 있을 때만 목록 생성)
+            logger.opt(lazy=True).debug(
+                "RAG 검색 상세 (version, status, similarity): {}",
+                lambda: [
+                    (
+                        doc.get("metadata", {}).get("version", "?"),
+                        doc.get("metadata", {}).get("status", "?"),
+                        round(doc.get("similarity", 0), 3),
+                    )
+                    for doc in docs
+                ],
+            )
 
             logger.info(f"RAG 검색 결과: {len(docs)}개 문서")
 
+            if not no_cache:
+                self._result_cache[cache_key] = docs
+
             return docs
 
-        except Exception as e:
-            logger.error(f"RAG 검색 실패: {e}")
+        except upstream_errors() as e:
+            logger.error("RAG 검색 실패: {}", e)
             return []
 
+    async def search_similar_batch(
+        self,
+        queries: list[str],
+        k: int = 3,
+        filter_status: Literal["active", "deprecated", "all"] = "active",
+        on_result: Callable[[int, list[dict]], None] | None = None,
+    ) -> list[list[dict]]:
+        """
+        여러 쿼리를 한 번에 검색합니다.
+
+        결과 캐시에 없는 쿼리만 검색합니다. 캐시에 없는 쿼리 임베딩만
+        한 번의 API 호출로 계산한 뒤, 쿼리별 match_documents RPC를 동시에 실행합니다.
+        (match_documents는 쿼리 임베딩 1개를 받는 함수이므로 RPC는 쿼리 수만큼 호출)
+
+        Args:
+            queries: 검색 쿼리 목록
+            k: 쿼리당 반환할 문서 수 (기본값: 3)
+            filter_status: 필터링 조건 (기본값: "active")
+            on_result: 쿼리별 결과가 나오는 즉시 (queries 인덱스, 문서 목록)으로
+                호출되는 콜백 (전체 묶음이 끝나기 전에 결과를 전달할 때 사용)
+
+        Returns:
+            list[list[dict]]: queries와 같은 순서의 검색 결과 목록
+        """
+        keys = [_embedding_key(query) for query in queries]
+        positions: dict[bytes, list[int]] = {}
+        for index, key in enumerate(keys):
+            positions.setdefault(key, []).append(index)
+
+        results: dict[bytes, list[dict]] = {}
+
+        def publish(key: bytes, docs: list[dict]) -> None:
+            results[key] = docs
+            if on_result is not None:
+                for index in positions[key]:
+                    on_result(index, docs)
+
+        # 결과 캐시 적중분은 먼저 꺼내 두어 이후 await 중 만료/축출되어도 안전
+        for key in positions:
+            cached = self._result_cache.get((key, k, filter_status))
+            if cached is not None:
+                publish(key, cached)
+        pending = {
+            key: query
+            for key, query in zip(keys, queries, strict=True)
+            if key not in results
+        }
+
+        logger.info(
+            f"RAG 묶음 검색: {len(queries)}개 쿼리 (k={k}, filter={filter_status}, "
+            f"cache hit={len(queries) - len(pending)})"
+        )
+
+        try:
+            # Step 1: 쿼리 임베딩 (캐시 미스만 1회 호출, 진행 중인 요청은 함께 대기)
+            embeddings: dict[bytes, list[float]] = {}
+            waiting: dict[bytes, asyncio.Future] = {}
+            misses: dict[bytes, str] = {}
+            for key, query in pending.items():
+                cached = self._embedding_cache.get(key)
+                if cached is not None:
+                    embeddings[key] = cached
+                elif (inflight := self._inflight.get(key)) is not None:
+                    waiting[key] = inflight
+                else:
+                    misses[key] = query
+
+            if misses:
+                loop = asyncio.get_running_loop()
+                futures = {key: loop.create_future() for key in misses}
+                self._inflight.update(futures)
+                try:
+                    vectors = await self._aembed_queries(list(misses.values()))
+                    for key, vector in zip(misses, vectors, strict=True):
+                        embeddings[key] = self._embedding_cache[key] = vector
+                except BaseException as e:
+                    self._fail_inflight(futures, e)
+                    raise
+
+                self._resolve_inflight(futures, embeddings)
+
+        except upstream_errors() as e:
+            logger.error("RAG 묶음 검색 실패: {}", e)
+            for key in pending:
+                publish(key, [])
+            return [results[key] for key in keys]
+
+        # Step 2: 쿼리별 Supabase RPC를 동시에 실행하고 끝나는 대로 결과 전달
+        async def match(key: bytes) -> None:
+            try:
+                if key in embeddings:
+                    embedding = embeddings[key]
+                else:
+                    embedding = await asyncio.shield(waiting[key])
+                docs = await self._match_documents(embedding, k, filter_status)
+            except upstream_errors() as e:
+                logger.error("RAG 묶음 검색 실패: {}", e)
+                publish(key, [])
+                return
+            self._result_cache[(key, k, filter_status)] = docs
+            publish(key, docs)
+
+        await asyncio.gather(*(match(key) for key in pending))
+        return [results[key] for key in keys]
+
     async def search_without_filter(self, query: str, k: int = 3) -> list[dict]:
         """
         필터링 없이 검색 (시연용)
@@ -151,8 +405,8 @@ class RAGRepository:
             stats = {row["status"]: row["count"] for row in (result.data or [])}
             logger.info(f"문서 통계: {stats}")
             return stats
-        except Exception as e:
-            logger.error(f"통계 조회 실패: {e}")
+        except upstream_errors() as e:
+            logger.error("통계 조회 실패: {}", e)
             return {}
 
     async def get_document_count(self, filter_status: str = "all") -> int:
@@ -181,8 +435,8 @@ class RAGRepository:
                 )
 
             return result.count or 0
-        except Exception as e:
-            logger.error(f"문서 수 조회 실패: {e}")
+        except upstream_errors() as e:
+            logger.error("문서 수 조회 실패: {}", e)
             return 0
 
 
@@ -203,3 +457,136 @@ def get_rag_repository() -> RAGRepository:
         _rag_repository = RAGRepository()
 
     return _rag_repository
+
+
+class RAGBatcher:
+    """
+    동시 RAG 요청 묶음 처리기 (micro-batching)
+
+    동시에 들어온 검색 요청을 모아 search_similar_batch 한 번으로 처리합니다.
+    첫 요청이 들어온 뒤 최대 max_wait초 동안(또는 max_batch개가 찰 때까지) 기다렸다가
+    한꺼번에 검색하므로, 동시 요청이 많을수록 임베딩 API 왕복 횟수가 줄어듭니다.
+
+    Example:
+        >>> batcher = get_rag_batcher()
+        >>> docs = await batcher.submit("루미 MBTI")
+    """
+
+    def __init__(
+        self,
+        repo: RAGRepository,
+        k: int = 3,
+        filter_status: Literal["active", "deprecated", "all"] = "active",
+        max_batch: int = 16,
+        max_wait: float = 0.01,
+    ):
+        """
+        RAGBatcher 초기화
+
+        Args:
+            repo: 검색에 사용할 RAGRepository
+            k: 쿼리당 반환할 문서 수
+            filter_status: 필터링 조건
+            max_batch: 한 번에 묶을 최대 요청 수
+            max_wait: 첫 요청 이후 추가 요청을 기다리는 최대 시간 (초)
+        """
+        self.repo = repo
+        self.k = k
+        self.filter_status = filter_status
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: asyncio.Queue[tuple[str, asyncio.Future]] | None = None
+        self._worker: asyncio.Task | None = None
+
+    async def submit(self, query: str) -> list[dict]:
+        """
+        검색 요청을 대기열에 넣고 결과를 기다립니다.
+
+        Args:
+            query: 검색 쿼리
+
+        Returns:
+            list[dict]: 검색된 문서 목록 (search_similar와 같은 형식)
+        """
+        loop = asyncio.get_running_loop()
+
+        # 워커는 현재 이벤트 루프에서 처음 요청이 들어올 때 시작
+        queue = self._queue
+        if (
+            queue is None
+            or self._worker is None
+            or self._worker.done()
+            or self._worker.get_loop() is not loop
+        ):
+            queue = self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run(queue))
+
+        future = loop.create_future()
+        queue.put_nowait((query, future))
+        return await future
+
+    async def _run(self, queue: asyncio.Queue[tuple[str, asyncio.Future]]) -> None:
+        """대기열에서 요청을 모아 묶음 검색을 실행하는 백그라운드 루프"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except TimeoutError:
+                    break
+
+            def resolve(index: int, docs: list[dict], batch=batch) -> None:
+                future = batch[index][1]
+                if not future.done():
+                    future.set_result(docs)
+
+            try:
+                results = await self.repo.search_similar_batch(
+                    [query for query, _ in batch],
+                    k=self.k,
+                    filter_status=self.filter_status,
+                    on_result=resolve,
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), docs in zip(batch, results, strict=True):
+                if not future.done():
+                    future.set_result(docs)
+
+
+# 싱글톤 인스턴스
+_rag_batcher: RAGBatcher | None = None
+
+
+def get_rag_batcher() -> RAGBatcher:
+    """
+    RAGBatcher 싱글톤 인스턴스를 반환합니다.
+
+    rag_node의 기본 검색 조건(k=3, 활성 문서만)으로 동작합니다.
+
+    Returns:
+        RAGBatcher: RAG 묶음 처리기
+    """
+    global _rag_batcher
+
+    if _rag_batcher is None:
+        _rag_batcher = RAGBatcher(
+            get_rag_repository(),
+            k=3,
+            filter_status="active",
+            max_batch=settings.rag_batch_max,
+            max_wait=settings.rag_batch_wait_ms / 1000,
+        )
+
+    return _rag_batcher
@@ -6,7 +6,7 @@ Supabase에서 루미의 스케줄 데이터를 조회합니다.
 
 from loguru import logger
 
-from . import get_supabase_client
+from . import get_supabase_client, upstream_errors
 
 
 class ScheduleRepository:
@@ -14,6 +14,7 @@ class ScheduleRepository:
     스케줄 Repository
 
     Supabase에서 스케줄을 조회합니다.
+    한 번에 최대 MAX_ROWS건까지만 조회합니다. (응답 크기/LLM 프롬프트 길이 제한)
 
     Example:
         >>> repo = ScheduleRepository()
@@ -23,6 +24,8 @@ class ScheduleRepository:
         ... )
     """
 
+    MAX_ROWS = 100
+
     def __init__(self):
         """ScheduleRepository 초기화"""
         self.client = get_supabase_client()
@@ -51,7 +54,7 @@ class ScheduleRepository:
             event_type: 이벤트 유형 필터 (선택)
 
         Returns:
-            list[dict]: 스케줄 목록
+            list[dict]: 스케줄 목록 (start_time 순, 최대 MAX_ROWS건)
         """
         try:
             query = self.client.table("schedules").select("*")
@@ -65,11 +68,32 @@ class ScheduleRepository:
             if event_type:
                 query = query.eq("event_type", event_type)
 
-            response = query.order("start_time").execute()
+            response = query.order("start_time").limit(self.MAX_ROWS).execute()
 
             logger.info(f"✅ Supabase 결과: {len(response.data)}건")
             return response.data
 
-        except Exception as e:
-            logger.error(f"Supabase 조회 오류: {e}")
+        except upstream_errors() as e:
+            logger.error("Supabase 조회 오류: {}", e)
             return []
+
+
+# 싱글톤 인스턴스
+_schedule_repository: ScheduleRepository | None = None
+
+
+def get_schedule_repository() -> ScheduleRepository:
+    """
+    ScheduleRepository 싱글톤 인스턴스를 반환합니다.
+
+    Supabase 연결에 실패하면 ValueError가 발생하며, 다음 호출 시 다시 시도합니다.
+
+    Returns:
+        ScheduleRepository: 스케줄 Repository 인스턴스
+    """
+    global _schedule_repository
+
+    if _schedule_repository is None:
+        _schedule_repository = ScheduleRepository()
+
+    return _schedule_repository
@@ -0,0 +1,206 @@
+"""
+대화 세션 히스토리 데이터 접근 계층
+
+세션별 대화 히스토리(HumanMessage/AIMessage)를 저장/조회합니다.
+
+저장소 선택:
+    - REDIS_URL 설정 시: Redis (워커/레플리카 간 히스토리 공유)
+    - 미설정 시: 프로세스 메모리 (TTLCache, 워커마다 별도)
+
+세션마다 최근 settings.max_turns턴(user+ai 쌍)만 유지하므로
+LLM에 전달되는 히스토리 길이가 대화가 길어져도 일정하게 유지됩니다.
+
+메시지는 LangChain 객체 대신 (role, content) 튜플로 저장하고
+조회 시 HumanMessage/AIMessage로 복원합니다. (0 = human, 1 = ai)
+
+세션의 마지막 라우터 의도(intent)도 settings.sticky_intent_ttl초 동안 보관하여
+짧은 후속 메시지("ㅇㅇ", "고마워")의 라우터 LLM 호출을 생략하는 데 사용합니다.
+
+Redis 측에서는 `maxmemory-policy allkeys-lru` 설정을 권장합니다.
+"""
+
+from collections import deque
+
+import orjson
+from cachetools import TTLCache
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from loguru import logger
+
+from app.core.config import settings
+
+from . import get_redis_client
+
+# 저장 형식: (role, content)
+_HUMAN = 0
+_AI = 1
+
+
+def _to_record(message: BaseMessage) -> tuple[int, str]:
+    """메시지를 저장용 (role, content) 튜플로 변환"""
+    role = _HUMAN if isinstance(message, HumanMessage) else _AI
+    return (role, message.content)
+
+
+def _to_msg(record) -> BaseMessage:
+    """저장된 (role, content)를 HumanMessage/AIMessage로 복원"""
+    role, content = record
+    return (
+        HumanMessage(content=content) if role == _HUMAN else AIMessage(content=content)
+    )
+
+
+class SessionRepository:
+    """
+    In-Memory 세션 Repository
+
+    서버 재시작 시 초기화되며, 워커 프로세스 간에 공유되지 않습니다.
+    - 최대 settings.session_max개 세션 유지 (초과 시 LRU 순으로 제거)
+    - 마지막 저장 후 settings.session_ttl초 동안 갱신이 없으면 만료
+    - 세션마다 deque(maxlen=2 * settings.max_turns)로 최근 메시지만 유지
+    - 메시지 객체 대신 (role, content) 튜플만 보관 (메시지당 메모리 절감)
+
+    Example:
+        >>> repo = SessionRepository()
+        >>> await repo.append("user123", [HumanMessage(content="안녕")])
+        >>> history = await repo.get_history("user123")
+    """
+
+    def __init__(self):
+        """SessionRepository 초기화"""
+        self._store: TTLCache[str, deque[tuple[int, str]]] = TTLCache(
+            maxsize=settings.session_max,
+            ttl=settings.session_ttl,
+        )
+        self._intents: TTLCache[str, str] = TTLCache(
+            maxsize=settings.session_max,
+            ttl=settings.sticky_intent_ttl,
+        )
+        self._max_messages = 2 * settings.max_turns
+
+    async def get_history(self, session_id: str) -> list[BaseMessage]:
+        """
+        세션의 대화 히스토리를 반환합니다.
+
+        Args:
+            session_id: 세션 식별자
+
+        Returns:
+            list[BaseMessage]: 대화 히스토리 (없으면 빈 리스트)
+        """
+        return [_to_msg(record) for record in self._store.get(session_id) or ()]
+
+    async def append(self, session_id: str, messages: list[BaseMessage]) -> None:
+        """
+        세션 히스토리에 메시지를 추가합니다.
+
+        읽기-수정-쓰기 사이에 await가 없으므로 이벤트 루프 안에서 원자적으로 처리되며,
+        재할당으로 TTL도 함께 갱신됩니다.
+
+        Args:
+            session_id: 세션 식별자
+            messages: 추가할 메시지 목록
+        """
+        history = self._store.get(session_id)
+        if history is None:
+            history = deque(maxlen=self._max_messages)
+        history.extend(_to_record(m) for m in messages)
+        self._store[session_id] = history
+
+    async def get_last_intent(self, session_id: str) -> str | None:
+        """
+        세션의 마지막 라우터 의도를 반환합니다.
+
+        Args:
+            session_id: 세션 식별자
+
+        Returns:
+            str | None: 마지막 intent (sticky_intent_ttl초가 지났으면 None)
+        """
+        return self._intents.get(session_id)
+
+    async def set_last_intent(self, session_id: str, intent: str) -> None:
+        """
+        세션의 마지막 라우터 의도를 저장합니다. (sticky_intent_ttl초 후 만료)
+
+        Args:
+            session_id: 세션 식별자
+            intent: 라우터가 분류한 intent
+        """
+        self._intents[session_id] = intent
+
+
+class RedisSessionRepository(SessionRepository):
+    """
+    Redis 세션 Repository
+
+    세션마다 Redis List 하나를 사용합니다. (키: session:{session_id})
+    - 값: [role, content] JSON
+    - 조회: LRANGE
+    - 추가: RPUSH + LTRIM(최근 2 * settings.max_turns개 유지) + EXPIRE
+    - 마지막 intent: session:{session_id}:intent (SET EX sticky_intent_ttl)
+
+    Attributes:
+        client: redis.asyncio 클라이언트
+    """
+
+    KEY_PREFIX = "session:"
+
+    def __init__(self, client):
+        """
+        RedisSessionRepository 초기화
+
+        Args:
+            client: redis.asyncio 클라이언트
+        """
+        self.client = client
+        self._max_messages = 2 * settings.max_turns
+        logger.info("💾 Redis 세션 저장소 사용")
+
+    async def get_history(self, session_id: str) -> list[BaseMessage]:
+        raw = await self.client.lrange(f"{self.KEY_PREFIX}{session_id}", 0, -1)
+        return [_to_msg(orjson.loads(item)) for item in raw]
+
+    async def append(self, session_id: str, messages: list[BaseMessage]) -> None:
+        key = f"{self.KEY_PREFIX}{session_id}"
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.rpush(key, *[orjson.dumps(_to_record(m)) for m in messages])
+            pipe.ltrim(key, -self._max_messages, -1)
+            pipe.expire(key, settings.session_ttl)
+            await pipe.execute()
+
+    async def get_last_intent(self, session_id: str) -> str | None:
+        intent = await self.client.get(f"{self.KEY_PREFIX}{session_id}:intent")
+        return intent.decode() if intent is not None else None
+
+    async def set_last_intent(self, session_id: str, intent: str) -> None:
+        await self.client.set(
+            f"{self.KEY_PREFIX}{session_id}:intent",
+            intent,
+            ex=settings.sticky_intent_ttl,
+        )
+
+
+# 싱글톤 인스턴스
+_session_repository: SessionRepository | None = None
+
+
+def get_session_repository() -> SessionRepository:
+    """
+    세션 Repository 싱글톤 인스턴스를 반환합니다.
+
+    Redis 클라이언트가 있으면 RedisSessionRepository,
+    없으면 In-Memory SessionRepository를 사용합니다.
+
+    Returns:
+        SessionRepository: 세션 Repository 인스턴스
+    """
+    global _session_repository
+
+    if _session_repository is None:
+        client = get_redis_client()
+        if client is not None:
+            _session_repository = RedisSessionRepository(client)
+        else:
+            _session_repository = SessionRepository()
+
+    return _session_repository
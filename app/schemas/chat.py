@@ -1,12 +1,21 @@
-from datetime import datetime
+from datetime import UTC, datetime
+from functools import partial
 from typing import Any, Literal
 
-from pydantic import BaseModel, Field
+import orjson
+from pydantic import BaseModel, ConfigDict, Field
+
+# SSE 프레임 고정 바이트 (data: {...}\n\n)
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
 
 
 class ChatRequest(BaseModel):
     """user -> server chat request schema."""
 
+    # 요청은 생성 후 변경하지 않음
+    model_config = ConfigDict(frozen=True)
+
     message: str = Field(
         ...,
         min_length=1,
@@ -50,8 +59,8 @@ class ChatResponse(BaseModel):
     )
 
     timestamp: datetime = Field(
-        default_factory=datetime.utcnow,
-        description="응답이 생성된 시간입니다.",
+        default_factory=partial(datetime.now, UTC),
+        description="응답이 생성된 시간입니다. (UTC)",
     )
 
 
@@ -103,6 +112,9 @@ class StreamEvent(BaseModel):
         ... )
     """
 
+    # 이벤트는 한 번 만들어 전송만 함 (생성 후 변경 불가)
+    model_config = ConfigDict(frozen=True)
+
     # TODO 2: type 필드 정의
     type: StreamEventType = Field(..., description="envet type")
 
@@ -139,17 +151,28 @@ class StreamEvent(BaseModel):
         description="에러 메시지",
     )
 
-    def to_sse(self) -> str:
+    def to_sse(self) -> bytes:
         """
-        SSE 형식 문자열로 변환
+        SSE 형식 바이트로 변환
+
+        orjson이 공백 없는 compact JSON을 UTF-8 바이트로 바로 만들어 주므로
+        str로 디코딩했다가 Starlette가 다시 인코딩하는 과정을 생략합니다.
+        토큰마다 호출되므로 model_dump() 대신 생성 시 지정한 필드(model_fields_set)만
+        골라 값을 바로 읽습니다. (JSON 키는 항상 필드 정의 순서)
+        (model_dump_json(exclude_none=True)나 pydantic 직렬화기보다 빠름)
 
         Returns:
-            str: SSE 형식 (data: {...}\n\n)
+            bytes: SSE 형식 (data: {...}\n\n)
         """
-        import orjson
-
-        # TODO 4: SSE 형식으로 변환. utf-8로 디코딩
-        data = {k: v for k, v in self.model_dump().items() if v is not None}
-        json_str = orjson.dumps(data).decode("utf-8")
-
-        return f"data: {json_str}\n\n"
+        # TODO 4: SSE 형식으로 변환 (지정하지 않은 필드/None 필드 제외)
+        # set인 model_fields_set을 순회하면 키 순서가 해시 시드마다 달라지므로
+        # 필드 정의 순서(model_fields)로 순회
+        values = self.__dict__
+        fields_set = self.model_fields_set
+        data = {
+            k: v
+            for k in type(self).model_fields
+            if k in fields_set and (v := values[k]) is not None
+        }
+
+        return _SSE_PREFIX + orjson.dumps(data) + _SSE_SUFFIX
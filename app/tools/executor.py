@@ -1,10 +1,61 @@
+import time
 from datetime import date, timedelta
+from functools import lru_cache
 from typing import Any
 
 from loguru import logger
 
-from app.repositories.fan_letter import FanLetterRepository
-from app.repositories.schedule import ScheduleRepository
+from app.repositories.fan_letter import get_fan_letter_repository
+from app.repositories.schedule import get_schedule_repository
+
+# recommend_song: 분위기 별칭 -> 분위기
+_MOOD_ALIAS: dict[str, str] = {
+    "happy": "happy",
+    "신남": "happy",
+    "기쁨": "happy",
+    "sad": "sad",
+    "잔잔": "sad",
+    "우울": "sad",
+    "focus": "focus",
+    "집중": "focus",
+}
+
+# recommend_song: 분위기별 추천곡 (임포트 시 한 번만 생성)
+_PLAYLIST: dict[str, tuple[str, ...]] = {
+    "happy": (
+        "NewJeans - Super Shy",
+        "IVE - I AM",
+        "LE SSERAFIM - ANTIFRAGILE",
+    ),
+    "sad": (
+        "AKMU - 어떻게 이별까지 사랑하겠어",
+        "아이유 - 밤편지",
+        "Paul Kim - 모든 날, 모든 순간",
+    ),
+    "focus": (
+        "Nujabes - Aruarian Dance",
+        "Yiruma - River Flows in You",
+        "Lofi Girl Mix",
+    ),
+}
+
+
+@lru_cache(maxsize=1)
+def _today_range_iso(minute_bucket: int) -> tuple[str, str]:
+    """
+    get_schedule 기본 조회 기간 (오늘, 오늘 + 7일)을 ISO 문자열로 반환합니다.
+
+    같은 분(minute_bucket) 안의 호출은 캐시된 문자열을 공유합니다.
+    (자정 직후 최대 1분 동안은 전날 기준 기간이 반환될 수 있음)
+
+    Args:
+        minute_bucket: int(time.time()) // 60
+
+    Returns:
+        tuple[str, str]: (start_date, end_date) - YYYY-MM-DD
+    """
+    today = date.today()
+    return today.isoformat(), (today + timedelta(days=7)).isoformat()
 
 
 class ToolExecutor:
@@ -47,12 +98,12 @@ class ToolExecutor:
             }
 
     async def _get_schedule(self, args: dict[str, Any]) -> dict[str, Any]:
-        today = date.today()
-        start_date = str(args.get("start_date") or today.isoformat())
-        end_date = str(args.get("end_date") or (today + timedelta(days=7)).isoformat())
+        default_start, default_end = _today_range_iso(int(time.time()) // 60)
+        start_date = str(args.get("start_date") or default_start)
+        end_date = str(args.get("end_date") or default_end)
         event_type = args.get("event_type")
 
-        repo = ScheduleRepository()
+        repo = get_schedule_repository()
         schedules = await repo.get_schedules(
             start_date=start_date,
             end_date=end_date,
@@ -93,7 +144,7 @@ class ToolExecutor:
                 "error": "팬레터 메시지가 비어 있어.",
             }
 
-        repo = FanLetterRepository()
+        repo = get_fan_letter_repository()
         letter_id = await repo.create(
             session_id=session_id or "anonymous",
             category=category,
@@ -122,37 +173,8 @@ class ToolExecutor:
 
     def _recommend_song(self, args: dict[str, Any]) -> dict[str, Any]:
         mood_input = str(args.get("mood") or "happy").strip()
-        mood_alias = {
-            "happy": "happy",
-            "신남": "happy",
-            "기쁨": "happy",
-            "sad": "sad",
-            "잔잔": "sad",
-            "우울": "sad",
-            "focus": "focus",
-            "집중": "focus",
-        }
-        mood = mood_alias.get(mood_input.lower(), "happy")
-
-        playlist = {
-            "happy": [
-                "NewJeans - Super Shy",
-                "IVE - I AM",
-                "LE SSERAFIM - ANTIFRAGILE",
-            ],
-            "sad": [
-                "AKMU - 어떻게 이별까지 사랑하겠어",
-                "아이유 - 밤편지",
-                "Paul Kim - 모든 날, 모든 순간",
-            ],
-            "focus": [
-                "Nujabes - Aruarian Dance",
-                "Yiruma - River Flows in You",
-                "Lofi Girl Mix",
-            ],
-        }
-
-        picks = playlist.get(mood, playlist["happy"])
+        mood = _MOOD_ALIAS.get(mood_input.lower(), "happy")
+        picks = _PLAYLIST.get(mood, _PLAYLIST["happy"])
 
         return {
             "success": True,
@@ -12,12 +12,33 @@ FastAPI에 마운트되어 /ui 경로에서 서비스됩니다.
     - 로컬: http://localhost:8000/ui
 """
 
+import asyncio
+import hashlib
 import re
 import uuid
+from functools import lru_cache
+from typing import Final
 
 import gradio as gr
+import httpx
+import orjson
 from loguru import logger
 
+from app.api.routes.chat import stream_with_status
+from app.core.config import settings
+
+# Direct Call 토큰 yield 묶음 기준 (yield마다 Gradio가 chat_history 전체를 직렬화/전송)
+# 마지막 yield 후 YIELD_INTERVAL초가 지났거나 YIELD_MIN_CHARS자 이상 쌓이면 yield
+YIELD_INTERVAL = 0.03
+YIELD_MIN_CHARS = 8
+
+# sanitize_for_gradio_markdown 틸다 패턴 (스트리밍 중 매 토큰마다 호출되므로 미리 컴파일)
+_TILDE_RE = re.compile(r"(?<!~)~(?!~)")
+# "~~"가 없으면 모든 ~가 단일 틸다이므로 정규식 대신 1:1 치환
+_TILDE_TABLE = str.maketrans("~", "～")
+# 이 길이 이하의 입력만 변환 결과를 캐시 (긴 최종 응답은 캐시하지 않음)
+SANITIZE_CACHE_MAX_LEN = 4096
+
 
 def sanitize_for_gradio_markdown(text: str) -> str:
     """
@@ -31,14 +52,98 @@ def sanitize_for_gradio_markdown(text: str) -> str:
         - **"텍스트"** → 볼드 안 됨
         - 해결: 따옴표 위치 조정
     """
+    # 0. 빈 문자열(StreamSanitizer의 빈 carry 등)이나 바꿀 문자가 없으면 그대로 반환
+    if not text or ("~" not in text and '"' not in text):
+        return text
+
+    # 스트리밍 토큰처럼 짧고 반복되는 입력은 캐시된 결과 사용
+    if len(text) <= SANITIZE_CACHE_MAX_LEN:
+        return _sanitize_cached(text)
+    return _sanitize(text)
+
+
+def _sanitize(text: str) -> str:
+    """sanitize_for_gradio_markdown 변환 (캐시 없음)"""
     # 1. 단일 틸다 → 전각 물결표 (취소선 방지)
-    text = re.sub(r"(?<!~)~(?!~)", "～", text)
+    if "~~" not in text:
+        text = text.translate(_TILDE_TABLE)
+    else:
+        text = _TILDE_RE.sub("～", text)
+
+    # 2. 볼드 마크다운 정리 (따옴표와 충돌 방지, 정규식 없이 단순 치환)
+    return text.replace('**"', '"**').replace('"**', '**"')
+
 
-    # 2. 볼드 마크다운 정리 (따옴표와 충돌 방지)
-    text = re.sub(r'\*\*"', '"**', text)
-    text = re.sub(r'"\*\*', '**"', text)
+_sanitize_cached = lru_cache(maxsize=2048)(_sanitize)
 
-    return text
+
+def _extract_multimodal(content) -> str:
+    """Gradio 멀티모달 형식([{'text': '...', 'type': 'text'}])에서 텍스트 추출"""
+    if isinstance(content, list):
+        for part in content:
+            if isinstance(part, dict) and part.get("type") == "text":
+                return part.get("text", "")
+    return str(content)
+
+
+def _extract_text(msg) -> str:
+    """
+    채팅 히스토리 메시지에서 텍스트를 추출합니다.
+
+    대부분의 메시지는 {"role": ..., "content": "문자열"}이므로 dict 조회 한 번으로
+    처리하고, 그 외 형식(멀티모달 리스트, dict가 아닌 메시지)만 느린 경로로 처리합니다.
+    """
+    try:
+        content = msg["content"]
+    except KeyError:
+        return ""
+    except TypeError:
+        return msg if type(msg) is str else str(msg)
+    return content if type(content) is str else _extract_multimodal(content)
+
+
+class StreamSanitizer:
+    """
+    스트리밍 토큰용 증분 sanitize_for_gradio_markdown
+
+    매 토큰마다 누적 응답 전체를 다시 sanitize하면 응답 길이 N에 대해 O(N²)이므로,
+    확정된 앞부분은 한 번만 변환해 두고 새로 들어온 부분만 변환합니다.
+
+    끝에 붙은 ~, *, " 문자는 다음 토큰에 따라 변환 결과가 달라질 수 있으므로
+    (예: "~" + "~", "**" + '"') 확정하지 않고 carry로 남겨 두었다가 다음 토큰과 함께
+    변환합니다. 그 외 문자에서 자르면 앞/뒤를 따로 변환한 결과가 전체를 변환한 결과와
+    같습니다.
+
+    Example:
+        >>> sanitizer = StreamSanitizer()
+        >>> sanitizer.feed("루미너스~")
+        '루미너스～'
+        >>> sanitizer.feed("~ 최고")
+        '루미너스~~ 최고'
+    """
+
+    _CARRY_CHARS = '~*"'
+
+    def __init__(self):
+        self._committed = ""
+        self._carry = ""
+
+    def feed(self, token: str) -> str:
+        """
+        토큰을 추가하고 지금까지의 응답 전체를 변환한 문자열을 반환합니다.
+
+        Args:
+            token: 새로 받은 토큰
+
+        Returns:
+            str: sanitize_for_gradio_markdown(누적 응답)과 같은 문자열
+        """
+        pending = self._carry + token
+        cut = len(pending.rstrip(self._CARRY_CHARS))
+        if cut:
+            self._committed += sanitize_for_gradio_markdown(pending[:cut])
+        self._carry = pending[cut:]
+        return self._committed + sanitize_for_gradio_markdown(self._carry)
 
 
 # ✨ 커스텀 CSS - 버추얼 아이돌 채팅앱 테마
@@ -66,16 +171,10 @@ footer { display: none !important; }
     font-family: 'Noto Sans KR', 'Quicksand', sans-serif !important;
     background: linear-gradient(-45deg, #0f0c29, #302b63, #24243e, #0f0c29) !important;
     background-size: 400% 400% !important;
-    animation: gradientShift 15s ease infinite !important;
+    background-position: 0% 50% !important;
     min-height: 100vh !important;
 }
 
-@keyframes gradientShift {
-    0% { background-position: 0% 50%; }
-    50% { background-position: 100% 50%; }
-    100% { background-position: 0% 50%; }
-}
-
 /* ===== 오로라 오버레이 효과 ===== */
 .gradio-container::before {
     content: '';
@@ -92,7 +191,7 @@ footer { display: none !important; }
     z-index: 0;
 }
 
-/* ===== 반짝이는 별 효과 ===== */
+/* ===== 별 효과 (정적, 무한 애니메이션은 스트리밍 중 전체 화면 리페인트 유발) ===== */
 .gradio-container::after {
     content: '';
     position: fixed;
@@ -108,17 +207,11 @@ footer { display: none !important; }
         radial-gradient(1px 1px at 160px 120px, white, transparent);
     background-repeat: repeat;
     background-size: 200px 200px;
-    animation: twinkle 4s ease-in-out infinite;
     pointer-events: none;
     z-index: 0;
     opacity: 0.5;
 }
 
-@keyframes twinkle {
-    0%, 100% { opacity: 0.3; }
-    50% { opacity: 0.7; }
-}
-
 /* ===== 메인 콘텐츠 영역 ===== */
 .main, .contain {
     position: relative;
@@ -142,12 +235,7 @@ footer { display: none !important; }
     background-clip: text;
     text-shadow: 0 0 40px rgba(255, 107, 157, 0.5);
     margin-bottom: 0.5rem;
-    animation: glow 2s ease-in-out infinite alternate;
-}
-
-@keyframes glow {
-    from { filter: drop-shadow(0 0 20px rgba(255, 107, 157, 0.4)); }
-    to { filter: drop-shadow(0 0 30px rgba(196, 78, 255, 0.6)); }
+    filter: drop-shadow(0 0 20px rgba(255, 107, 157, 0.4));
 }
 
 .header-container p {
@@ -455,6 +543,25 @@ button.copy {
 }
 """
 
+
+def _minify_css(css: str) -> str:
+    """주석 제거 + 공백 축약으로 CSS 크기를 줄입니다. (임포트 시 한 번 실행)"""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{};,])\s*", r"\1", css).replace(";}", "}").strip()
+
+
+# CUSTOM_CSS는 인라인 <style> 대신 /static/lumi.css로 제공 (app.main에서 라우트 등록)
+# - 주석/공백을 제거한 최소화 CSS만 전송
+# - 페이지에는 <link> 한 줄만 삽입 (_CSS_LINK_HTML)
+# - 브라우저가 CSS를 캐시하므로 페이지 로드마다 HTML에 포함해 다시 보내지 않음
+# - URL에 내용 해시(v=)를 붙여 CSS가 바뀌면 캐시가 자동으로 무효화됨
+CUSTOM_CSS_BYTES: Final[bytes] = _minify_css(CUSTOM_CSS).encode()
+CSS_URL: Final[str] = (
+    "/static/lumi.css?v=" + hashlib.blake2s(CUSTOM_CSS_BYTES, digest_size=4).hexdigest()
+)
+_CSS_LINK_HTML: Final[str] = f'<link rel="stylesheet" href="{CSS_URL}">'
+
 # 테마 설정
 THEME = gr.themes.Base(
     primary_hue="pink",
@@ -509,8 +616,6 @@ def create_chat_handler():
 
     🔧 수정: 세션 ID를 파라미터로 받아 사용자별 격리
     """
-    # Direct Call - stream_with_status 직접 호출 (노드 상태 + 토큰)
-    from app.api.routes.chat import stream_with_status
 
     async def chat_with_lumi_stream(message: str, history: list, session_id: str):
         """
@@ -536,6 +641,11 @@ def create_chat_handler():
         try:
             # Direct Call - stream_with_status 함수 직접 호출
             current_response = ""
+            # 토큰마다 호출되는 메서드는 지역 변수로 바인딩 (속성 조회 생략)
+            feed = StreamSanitizer().feed
+            clock = asyncio.get_running_loop().time
+            last_yield_at = float("-inf")
+            yielded_len = 0
 
             async for status, token, final, tool_used in stream_with_status(
                 message=message,
@@ -547,16 +657,30 @@ def create_chat_handler():
                     yield status
 
                 # 토큰 스트리밍 - 글자 단위로 누적 (상태 메시지 대체)
+                # (새 토큰만 sanitize, current_response는 sanitize된 누적 응답)
+                # 토큰마다 yield하지 않고 YIELD_INTERVAL/YIELD_MIN_CHARS 기준으로 묶어서 yield
                 if token:
-                    current_response += token
-                    yield sanitize_for_gradio_markdown(current_response)
+                    current_response = feed(token)
+                    now = clock()
+                    if (
+                        now - last_yield_at >= YIELD_INTERVAL
+                        or len(current_response) - yielded_len >= YIELD_MIN_CHARS
+                    ):
+                        last_yield_at = now
+                        yielded_len = len(current_response)
+                        yield current_response
 
                 if final:
                     # 최종 응답 (마크다운 수정 적용)
-                    final_content = final
-                    if tool_used:
-                        final_content += f"\n\n✨ _{tool_used}_"
+                    final_content = (
+                        f"{final}\n\n✨ _{tool_used}_" if tool_used else final
+                    )
                     yield sanitize_for_gradio_markdown(final_content)
+                    yielded_len = len(current_response)
+
+            # final 없이 끝난 경우 아직 yield하지 않은 토큰 반영
+            if yielded_len != len(current_response):
+                yield current_response
 
         except Exception as e:
             logger.error(f"채팅 오류: {e}")
@@ -570,6 +694,66 @@ def create_chat_handler():
 # =============================================================
 
 
+async def _aiter_sse_events(response):
+    """
+    SSE 응답 바이트를 이벤트(dict) 단위로 파싱합니다.
+
+    줄 단위 str 디코딩(aiter_lines) 대신 바이트 버퍼를 b"\n\n"(이벤트 구분자)로
+    나누고, "data: " 이후 페이로드를 orjson으로 바로 파싱합니다.
+
+    Args:
+        response: httpx 스트리밍 응답
+
+    Yields:
+        dict: SSE data 페이로드 (JSON 파싱 실패 프레임은 건너뜀)
+    """
+    buffer = bytearray()
+    async for chunk in response.aiter_bytes():
+        buffer += chunk
+        while (end := buffer.find(b"\n\n")) >= 0:
+            frame = bytes(buffer[:end])
+            del buffer[: end + 2]
+
+            # SSE 형식: "data: {...}"
+            if not frame.startswith(b"data: "):
+                continue
+            try:
+                yield orjson.loads(frame[6:])  # "data: " 제거
+            except orjson.JSONDecodeError:
+                continue
+
+
+# SSE 방식 공용 httpx 클라이언트 (백엔드와의 keep-alive 연결을 대화 턴 간에 재사용)
+_http_client: httpx.AsyncClient | None = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """
+    SSE 방식에서 사용할 httpx.AsyncClient 싱글톤을 반환합니다.
+
+    메시지마다 클라이언트(커넥션 풀)를 새로 만들면 매번 TCP 연결을 새로 맺으므로
+    처음 호출 시 한 번만 생성해 재사용합니다.
+    """
+    global _http_client
+
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(60.0),
+            limits=httpx.Limits(max_keepalive_connections=32),
+        )
+
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """SSE 방식 공용 httpx 클라이언트를 닫습니다. (서버 종료 시 호출)"""
+    global _http_client
+
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
 def create_chat_handler_sse(api_base_url: str = "http://localhost:8000"):
     """
     SSE 스트리밍 채팅 핸들러 (HTTP 방식)
@@ -586,9 +770,6 @@ def create_chat_handler_sse(api_base_url: str = "http://localhost:8000"):
     Args:
         api_base_url: FastAPI 서버 주소 (기본값: http://localhost:8000)
     """
-    import json
-
-    import httpx
 
     async def chat_with_lumi_sse(message: str, history: list, session_id: str):
         """
@@ -616,67 +797,59 @@ def create_chat_handler_sse(api_base_url: str = "http://localhost:8000"):
 
         try:
             current_response = ""
+            feed = StreamSanitizer().feed  # 토큰마다 호출 (속성 조회 생략)
 
             # 🔑 핵심: httpx로 SSE 스트리밍 연결!
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                async with client.stream(
-                    "POST",
-                    f"{api_base_url}/api/v1/chat/stream",
-                    json={
-                        "message": message,
-                        "session_id": session_id,
-                    },
-                ) as response:
-                    # 🔑 SSE 이벤트를 한 줄씩 읽기
-                    async for line in response.aiter_lines():
-                        # SSE 형식: "data: {...}"
-                        if not line.startswith("data: "):
-                            continue
-
-                        # JSON 파싱
-                        try:
-                            event = json.loads(line[6:])  # "data: " 제거
-                        except json.JSONDecodeError:
-                            continue
-
-                        event_type = event.get("type")
-
-                        # 📍 thinking: 노드 진행 상황
-                        # content에 이미 "🔀 루미 생각 중..." 같은 메시지가 들어있음
-                        if event_type == "thinking":
-                            status_msg = event.get("content", "")
-                            if status_msg and not current_response:
-                                yield status_msg
-
-                        # 📍 token: LLM 토큰 스트리밍
-                        elif event_type == "token":
-                            token = event.get("content", "")
-                            if token:
-                                current_response += token
-                                yield sanitize_for_gradio_markdown(current_response)
-
-                        # 📍 tool: Tool 실행 결과
-                        elif event_type == "tool":
-                            tool_name = event.get("tool_name", "")
-                            if tool_name and not current_response:
-                                yield f"🔧 {tool_name} 실행 완료!"
-
-                        # 📍 response: 최종 응답
-                        elif event_type == "response":
-                            final_content = event.get("content", "")
-                            tool_used = event.get("tool_used")
-                            if tool_used:
-                                final_content += f"\n\n✨ _{tool_used}_"
-                            yield sanitize_for_gradio_markdown(final_content)
-
-                        # 📍 error: 에러
-                        elif event_type == "error":
-                            error_msg = event.get("error", "알 수 없는 오류")
-                            yield f"❌ 오류: {error_msg}"
-
-                        # 📍 done: 종료
-                        elif event_type == "done":
-                            break
+            client = _get_http_client()
+            async with client.stream(
+                "POST",
+                f"{api_base_url}/api/v1/chat/stream",
+                json={
+                    "message": message,
+                    "session_id": session_id,
+                },
+            ) as response:
+                # 🔑 SSE 이벤트를 하나씩 읽기 (바이트 단위 파싱)
+                async for event in _aiter_sse_events(response):
+                    event_type = event.get("type")
+
+                    # 📍 thinking: 노드 진행 상황
+                    # content에 이미 "🔀 루미 생각 중..." 같은 메시지가 들어있음
+                    if event_type == "thinking":
+                        status_msg = event.get("content", "")
+                        if status_msg and not current_response:
+                            yield status_msg
+
+                    # 📍 token: LLM 토큰 스트리밍
+                    elif event_type == "token":
+                        token = event.get("content", "")
+                        if token:
+                            current_response = feed(token)
+                            yield current_response
+
+                    # 📍 tool: Tool 실행 결과
+                    elif event_type == "tool":
+                        tool_name = event.get("tool_name", "")
+                        if tool_name and not current_response:
+                            yield f"🔧 {tool_name} 실행 완료!"
+
+                    # 📍 response: 최종 응답
+                    elif event_type == "response":
+                        content = event.get("content", "")
+                        tool_used = event.get("tool_used")
+                        final_content = (
+                            f"{content}\n\n✨ _{tool_used}_" if tool_used else content
+                        )
+                        yield sanitize_for_gradio_markdown(final_content)
+
+                    # 📍 error: 에러
+                    elif event_type == "error":
+                        error_msg = event.get("error", "알 수 없는 오류")
+                        yield f"❌ 오류: {error_msg}"
+
+                    # 📍 done: 종료
+                    elif event_type == "done":
+                        break
 
         except httpx.ConnectError as e:
             logger.error(f"SSE 연결 실패: {e}")
@@ -709,8 +882,6 @@ def create_demo(api_base_url: str | None = None) -> gr.Blocks:
     Returns:
         gr.Blocks: Gradio 앱
     """
-    from app.core.config import settings
-
     # API URL이 없으면 settings의 host/port 사용
     if not api_base_url:
         host = "localhost" if settings.host == "0.0.0.0" else settings.host
@@ -740,8 +911,9 @@ def create_demo(api_base_url: str | None = None) -> gr.Blocks:
     # 🔧 세션 ID 생성 헬퍼 함수
     def generate_session_id() -> str:
         """브라우저 탭마다 고유한 세션 ID 생성"""
-        new_id = f"gradio-{uuid.uuid4().hex[:8]}"
-        logger.info(f"🔑 새 Gradio 세션 생성: {new_id}")
+        # 앞 4바이트만 hex로 변환 (32자 hex 문자열을 만들어 자르지 않음)
+        new_id = f"gradio-{uuid.uuid4().bytes[:4].hex()}"
+        logger.info("🔑 새 Gradio 세션 생성: {}", new_id)
         return new_id
 
     with gr.Blocks(
@@ -749,8 +921,8 @@ def create_demo(api_base_url: str | None = None) -> gr.Blocks:
         head=META_TAGS,
         analytics_enabled=False,
     ) as demo:
-        # CSS 직접 삽입 (마운트 시에도 적용되도록)
-        gr.HTML(f"<style>{CUSTOM_CSS}</style>")
+        # CSS 링크 삽입 (마운트 시에도 적용되도록 head 대신 본문에 삽입)
+        gr.HTML(_CSS_LINK_HTML)
 
         # 🔧 수정: gr.State로 사용자별 세션 ID 관리
         # 페이지 로드 시 고유한 세션 ID가 생성되어 각 탭/사용자가 격리됨
@@ -830,38 +1002,24 @@ def create_demo(api_base_url: str | None = None) -> gr.Blocks:
                 yield chat_history
                 return
 
-            # 마지막 사용자 메시지 가져오기
-            last_msg = chat_history[-1]
-
-            # 메시지 내용 추출 (다양한 형식 처리)
-            if isinstance(last_msg, dict):
-                content = last_msg.get("content", "")
-                # Gradio 멀티모달 형식: [{'text': '...', 'type': 'text'}]
-                if isinstance(content, list):
-                    for part in content:
-                        if isinstance(part, dict) and part.get("type") == "text":
-                            last_user_msg = part.get("text", "")
-                            break
-                    else:
-                        last_user_msg = str(content)
-                else:
-                    last_user_msg = str(content)
-            else:
-                last_user_msg = str(last_msg)
+            # 마지막 사용자 메시지 내용 추출 (다양한 형식 처리)
+            last_user_msg = _extract_text(chat_history[-1])
 
             if not last_user_msg:
                 yield chat_history
                 return
 
             # 스트리밍 응답 생성
-            chat_history.append({"role": "assistant", "content": ""})
+            # assistant 메시지 dict는 한 번만 만들고 content만 갱신
+            assistant_msg = {"role": "assistant", "content": ""}
+            chat_history.append(assistant_msg)
 
             # 🔧 수정: session_id를 chat_with_lumi에 전달
             async for partial_response in chat_with_lumi(
-                str(last_user_msg), chat_history, session_id
+                last_user_msg, chat_history, session_id
             ):
                 # 마지막 assistant 메시지 업데이트
-                chat_history[-1] = {"role": "assistant", "content": partial_response}
+                assistant_msg["content"] = partial_response
                 yield chat_history
 
         # 전송 이벤트 - 스트리밍 체이닝
@@ -7,13 +7,47 @@ pytest-asyncio를 사용하여 비동기 테스트를 수행합니다.
     uv run pytest tests/test_agent.py -v
 """
 
+import asyncio
+import os
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
 import pytest
+from cachetools import TTLCache
+from langchain_core.messages import AIMessage, HumanMessage
 
+from app.core.config import settings
 from app.graph.edges import route_by_intent
+from app.graph.nodes import RouterOutput, _prefetch_enabled, router_node
 from app.graph.state import LumiState, create_initial_state
+from app.repositories.rag import RAGBatcher, RAGRepository, _embedding_key
+from app.repositories.session import (
+    RedisSessionRepository,
+    SessionRepository,
+    get_session_repository,
+)
 from app.tools.executor import ToolExecutor
 
+# 외부 서비스(Supabase)를 호출하는 통합 테스트는 RUN_INTEGRATION=1일 때만 실행
+requires_integration = pytest.mark.skipif(
+    not os.getenv("RUN_INTEGRATION"),
+    reason="통합 테스트: RUN_INTEGRATION=1 설정 시 실행",
+)
+
+# Edge 테스트용 기본 상태 (테스트마다 복사 후 필요한 키만 덮어씀)
+_BASE_STATE: LumiState = {
+    **dict.fromkeys(("intent", "tool_name", "tool_args", "tool_result", "user_id")),
+    "messages": [],
+    "retrieved_docs": [],
+    "session_id": "test",
+}
+
+# 의도별 라우팅 테스트가 공유하는 상태 (케이스마다 intent만 변경)
+_ROUTE_STATE: LumiState = {**_BASE_STATE}
 
+
+@pytest.mark.fast
 class TestState:
     """State 관련 테스트"""
 
@@ -38,135 +72,516 @@ class TestState:
         assert state["user_id"] is None
 
 
+@pytest.mark.fast
 class TestEdges:
     """Edge 라우팅 테스트"""
 
-    def test_route_by_intent_chat(self):
-        """chat 의도 라우팅 테스트"""
+    @pytest.mark.parametrize(
+        ("intent", "expected"),
+        [
+            ("chat", "response"),
+            ("rag", "rag"),
+            ("tool", "tool"),
+            (None, "response"),  # 기본 의도 (None -> response)
+            ("unknown", "response"),  # 알 수 없는 의도 -> response
+        ],
+    )
+    def test_route_by_intent(self, intent, expected):
+        """의도별 라우팅 테스트"""
+        # route_by_intent는 state를 보관/수정하지 않으므로 intent만 바꿔 재사용
+        _ROUTE_STATE["intent"] = intent
+
+        assert route_by_intent(_ROUTE_STATE) == expected
+
+    def test_route_by_intent_rag_prefetched(self):
+        """rag 의도 + 선검색 문서가 있으면 rag 노드 생략"""
         state: LumiState = {
-            "messages": [],
-            "intent": "chat",
-            "retrieved_docs": [],
-            "tool_name": None,
-            "tool_args": None,
-            "tool_result": None,
-            "session_id": "test",
-            "user_id": None,
+            **_BASE_STATE,
+            "intent": "rag",
+            "retrieved_docs": ["루미는 프리즘 행성 출신 외계인 공주야."],
         }
 
         result = route_by_intent(state)
         assert result == "response"
 
-    def test_route_by_intent_rag(self):
-        """rag 의도 라우팅 테스트"""
-        state: LumiState = {
-            "messages": [],
-            "intent": "rag",
-            "retrieved_docs": [],
-            "tool_name": None,
-            "tool_args": None,
-            "tool_result": None,
-            "session_id": "test",
-            "user_id": None,
-        }
 
-        result = route_by_intent(state)
-        assert result == "rag"
+class TestRouterNode:
+    """Router 노드 테스트"""
 
-    def test_route_by_intent_tool(self):
-        """tool 의도 라우팅 테스트"""
-        state: LumiState = {
-            "messages": [],
-            "intent": "tool",
-            "retrieved_docs": [],
-            "tool_name": "get_schedule",
-            "tool_args": {},
-            "tool_result": None,
-            "session_id": "test",
-            "user_id": None,
-        }
+    async def test_router_cache_hit_skips_llm(self):
+        """같은 입력은 캐시된 분류 결과를 사용 (LLM 1회만 호출)"""
+        structured_llm = AsyncMock()
+        structured_llm.ainvoke.return_value = RouterOutput(intent="chat")
+        state = create_initial_state(
+            session_id="test-session",
+            messages=[HumanMessage(content="라우터 캐시 테스트")],
+        )
 
-        result = route_by_intent(state)
-        assert result == "tool"
+        with patch("app.graph.nodes.get_router_llm", return_value=structured_llm):
+            first = await router_node(state)
+            second = await router_node(state)
 
-    def test_route_by_intent_default(self):
-        """기본 의도 라우팅 테스트 (None -> response)"""
-        state: LumiState = {
-            "messages": [],
-            "intent": None,
-            "retrieved_docs": [],
-            "tool_name": None,
-            "tool_args": None,
-            "tool_result": None,
-            "session_id": "test",
-            "user_id": None,
-        }
+        assert first == second
+        assert first["intent"] == "chat"
+        structured_llm.ainvoke.assert_awaited_once()
 
-        result = route_by_intent(state)
-        assert result == "response"
+    async def test_router_sticky_chat_followup(self):
+        """직전 의도가 chat이면 짧은 후속 메시지는 LLM 없이 chat 유지"""
+        await get_session_repository().set_last_intent("sticky-session", "chat")
+        structured_llm = AsyncMock()
+        state = create_initial_state(
+            session_id="sticky-session",
+            messages=[HumanMessage(content="고마워")],
+        )
 
+        with patch("app.graph.nodes.get_router_llm", return_value=structured_llm):
+            result = await router_node(state)
 
-class TestToolExecutor:
-    """Tool Executor 테스트"""
+        assert result["intent"] == "chat"
+        structured_llm.ainvoke.assert_not_awaited()
 
-    @pytest.fixture
-    def executor(self):
-        """ToolExecutor 인스턴스 생성"""
-        return ToolExecutor()
+    async def test_router_short_tool_request_after_chat(self):
+        """직전 의도가 chat이어도 짧은 요청("일정 알려줘")은 LLM으로 분류"""
+        await get_session_repository().set_last_intent("sticky-tool-session", "chat")
+        structured_llm = AsyncMock()
+        structured_llm.ainvoke.return_value = RouterOutput(
+            intent="tool", tool_name="get_schedule", tool_args={}
+        )
+        state = create_initial_state(
+            session_id="sticky-tool-session",
+            messages=[HumanMessage(content="일정 알려줘")],
+        )
 
-    @pytest.mark.asyncio
-    async def test_recommend_song_happy(self, executor):
-        """노래 추천 테스트 (happy)"""
-        result = await executor.execute(
-            tool_name="recommend_song",
-            tool_args={"mood": "happy"},
-            session_id="test-session",
+        with (
+            patch("app.graph.nodes.get_router_llm", return_value=structured_llm),
+            patch("app.graph.nodes._retrieve_docs", new=AsyncMock(return_value=[])),
+        ):
+            result = await router_node(state)
+
+        assert result["intent"] == "tool"
+        assert result["tool_name"] == "get_schedule"
+        structured_llm.ainvoke.assert_awaited_once()
+
+    async def test_router_intent_store_failure_keeps_result(self):
+        """마지막 의도 저장이 실패해도 LLM 분류 결과는 그대로 사용"""
+        structured_llm = AsyncMock()
+        structured_llm.ainvoke.return_value = RouterOutput(
+            intent="tool", tool_name="get_schedule", tool_args={}
+        )
+        session_repo = AsyncMock()
+        session_repo.set_last_intent.side_effect = ConnectionError("redis down")
+        state = create_initial_state(
+            session_id="store-fail-session",
+            messages=[HumanMessage(content="의도 저장 실패 테스트")],
         )
 
-        assert result["success"] is True
-        assert "data" in result
-        assert "song" in result["data"]
-        assert result.get("mock") is True
+        with (
+            patch("app.graph.nodes.get_router_llm", return_value=structured_llm),
+            patch("app.graph.nodes.get_session_repository", return_value=session_repo),
+            patch("app.graph.nodes._retrieve_docs", new=AsyncMock(return_value=[])),
+        ):
+            result = await router_node(state)
+
+        assert result["intent"] == "tool"
+        session_repo.set_last_intent.assert_awaited_once()
+
+
+def _router_state(content: str) -> LumiState:
+    """라우터 선검색 테스트용 상태 (라우터 캐시에 걸리지 않도록 입력을 매번 다르게)"""
+    return create_initial_state(
+        session_id="prefetch-session", messages=[HumanMessage(content=content)]
+    )
+
+
+def _router_llm(intent: str) -> AsyncMock:
+    """지정한 intent로 분류하는 라우터 LLM Mock (실제 호출처럼 한 번 양보)"""
+
+    async def classify(*args, **kwargs):
+        await asyncio.sleep(0)
+        return RouterOutput(intent=intent)
+
+    structured_llm = AsyncMock()
+    structured_llm.ainvoke.side_effect = classify
+    return structured_llm
+
+
+@pytest.fixture
+def prefetch_enabled():
+    """RAG 설정이 없는 테스트 환경에서도 선검색을 켬 (_retrieve_docs는 테스트에서 patch)"""
+    with patch("app.graph.nodes._prefetch_enabled", return_value=True):
+        yield
+
+
+@pytest.mark.usefixtures("prefetch_enabled")
+class TestRouterPrefetch:
+    """Router 노드의 RAG 선검색 테스트"""
+
+    async def test_rag_intent_returns_prefetched_docs(self):
+        """rag 의도면 선검색한 문서를 함께 반환 -> rag 노드 생략"""
+        with (
+            patch("app.graph.nodes.get_router_llm", return_value=_router_llm("rag")),
+            patch(
+                "app.graph.nodes._retrieve_docs",
+                new=AsyncMock(return_value=["루미는 ENFP"]),
+            ),
+        ):
+            result = await router_node(_router_state("선검색 테스트: 루미 MBTI"))
+
+        assert result["retrieved_docs"] == ["루미는 ENFP"]
+        assert route_by_intent({**_BASE_STATE, **result}) == "response"
+
+    @pytest.mark.parametrize("intent", ["chat", "tool"])
+    async def test_non_rag_intent_cancels_prefetch(self, intent):
+        """rag가 아닌 의도면 진행 중인 선검색을 취소"""
+        prefetch_tasks = []
+
+        async def slow_retrieve(user_input):
+            prefetch_tasks.append(asyncio.current_task())
+            await asyncio.Event().wait()
+
+        with (
+            patch("app.graph.nodes.get_router_llm", return_value=_router_llm(intent)),
+            patch("app.graph.nodes._retrieve_docs", new=slow_retrieve),
+        ):
+            result = await router_node(_router_state(f"선검색 취소 테스트: {intent}"))
+            await asyncio.sleep(0)  # 취소가 태스크에 전달될 때까지 양보
+
+        assert "retrieved_docs" not in result
+        assert len(prefetch_tasks) == 1 and prefetch_tasks[0].cancelled()
+
+    async def test_prefetch_failure_falls_back_to_rag_node(self):
+        """선검색이 실패하면 문서 없이 반환 -> rag 노드에서 다시 검색"""
+        with (
+            patch("app.graph.nodes.get_router_llm", return_value=_router_llm("rag")),
+            patch(
+                "app.graph.nodes._retrieve_docs",
+                new=AsyncMock(side_effect=ConnectionError("supabase down")),
+            ),
+        ):
+            result = await router_node(_router_state("선검색 실패 테스트"))
+
+        assert result["intent"] == "rag"
+        assert "retrieved_docs" not in result
+        assert route_by_intent({**_BASE_STATE, **result}) == "rag"
+
+    async def test_router_cancel_cancels_prefetch(self):
+        """분류 중 요청이 취소되면(연결 종료) 진행 중인 선검색도 취소"""
+        prefetch_tasks = []
+
+        async def slow_retrieve(user_input):
+            prefetch_tasks.append(asyncio.current_task())
+            await asyncio.Event().wait()
+
+        async def hang(*args, **kwargs):
+            await asyncio.Event().wait()
+
+        with (
+            patch(
+                "app.graph.nodes.get_router_llm",
+                return_value=SimpleNamespace(ainvoke=hang),
+            ),
+            patch("app.graph.nodes._retrieve_docs", new=slow_retrieve),
+        ):
+            router = asyncio.create_task(
+                router_node(_router_state("선검색 취소 전파 테스트"))
+            )
+            await asyncio.sleep(0.01)  # 선검색이 시작되도록 양보
+            router.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await router
+            await asyncio.sleep(0)  # 취소가 선검색 태스크에 전달될 때까지 양보
+
+        assert len(prefetch_tasks) == 1 and prefetch_tasks[0].cancelled()
+
+
+class TestRouterPrefetchDisabled:
+    """RAG를 사용할 수 없는 환경의 Router 선검색 테스트"""
+
+    async def test_prefetch_skipped_when_rag_unavailable(self):
+        """RAG 묶음 처리기를 만들 수 없으면 선검색 없이 분류 (생성은 한 번만 시도)"""
+        retrieve = AsyncMock(return_value=["문서"])
+        _prefetch_enabled.cache_clear()
+        try:
+            with (
+                patch(
+                    "app.graph.nodes.get_router_llm", return_value=_router_llm("rag")
+                ),
+                patch(
+                    "app.graph.nodes.get_rag_batcher",
+                    side_effect=ValueError("Supabase 미설정"),
+                ) as get_batcher,
+                patch("app.graph.nodes._retrieve_docs", new=retrieve),
+            ):
+                first = await router_node(_router_state("선검색 비활성 테스트 1"))
+                await router_node(_router_state("선검색 비활성 테스트 2"))
+        finally:
+            _prefetch_enabled.cache_clear()
+
+        assert first["intent"] == "rag"
+        assert route_by_intent({**_BASE_STATE, **first}) == "rag"
+        retrieve.assert_not_called()
+        get_batcher.assert_called_once()
+
+
+class _FakeSupabase:
+    """match_documents RPC를 흉내 내는 동기 클라이언트 (임베딩 값만큼 지연)"""
+
+    def rpc(self, name, params):
+        def execute():
+            delay = params["query_embedding"][0]
+            time.sleep(delay)
+            return SimpleNamespace(data=[{"content": f"delay={delay}"}])
+
+        return SimpleNamespace(execute=execute)
+
+
+@pytest.fixture
+def rag_repo():
+    """외부 API 없이 동작하는 RAGRepository (Supabase는 가짜 클라이언트)"""
+    with (
+        patch(
+            "app.repositories.rag.settings",
+            SimpleNamespace(upstage_api_key="test-key"),
+        ),
+        patch("app.repositories.rag.get_supabase_client", return_value=_FakeSupabase()),
+    ):
+        return RAGRepository()
+
+
+class TestRAGRepository:
+    """RAG 묶음 검색 테스트"""
+
+    async def test_aembed_queries_uses_query_model(self, rag_repo):
+        """묶음 임베딩은 query 모델로 한 번에 요청 (반복 호출해도 모델명 유지)"""
+        create = AsyncMock(
+            return_value=SimpleNamespace(
+                data=[
+                    SimpleNamespace(index=0, embedding=[0.1]),
+                    SimpleNamespace(index=1, embedding=[0.2]),
+                ]
+            )
+        )
 
-    @pytest.mark.asyncio
-    async def test_recommend_song_sad(self, executor):
-        """노래 추천 테스트 (sad)"""
-        result = await executor.execute(
-            tool_name="recommend_song",
-            tool_args={"mood": "sad"},
-            session_id="test-session",
+        with patch.object(
+            rag_repo.embeddings, "async_client", SimpleNamespace(create=create)
+        ):
+            first = await rag_repo._aembed_queries(["질문1", "질문2"])
+            await rag_repo._aembed_queries(["질문1", "질문2"])
+
+        assert first == [[0.1], [0.2]]
+        for call in create.await_args_list:
+            assert call.kwargs["model"] == "solar-embedding-1-large-query"
+            assert call.kwargs["input"] == ["질문1", "질문2"]
+
+    async def test_aembed_queries_orders_by_index(self, rag_repo):
+        """응답이 순서가 뒤바뀌어 와도 index 기준으로 쿼리 순서에 맞춤"""
+        create = AsyncMock(
+            return_value=SimpleNamespace(
+                data=[
+                    SimpleNamespace(index=1, embedding=[0.2]),
+                    SimpleNamespace(index=0, embedding=[0.1]),
+                ]
+            )
         )
 
-        assert result["success"] is True
-        assert result["data"]["mood"] == "sad"
+        with patch.object(
+            rag_repo.embeddings, "async_client", SimpleNamespace(create=create)
+        ):
+            vectors = await rag_repo._aembed_queries(["질문1", "질문2"])
+            with pytest.raises(ValueError):
+                await rag_repo._aembed_queries(["질문1", "질문2", "질문3"])
 
-    @pytest.mark.asyncio
-    async def test_get_weather(self, executor):
-        """날씨 조회 테스트"""
-        result = await executor.execute(
-            tool_name="get_weather",
-            tool_args={},
-            session_id="test-session",
+        assert vectors == [[0.1], [0.2]]
+
+    async def test_batch_resolves_each_query_as_its_rpc_returns(self, rag_repo):
+        """묶음 안에서 먼저 끝난 RPC의 호출자는 느린 RPC를 기다리지 않음"""
+        # 임베딩 캐시를 채워 두어 임베딩 API 호출 없이 RPC만 실행
+        rag_repo._embedding_cache[_embedding_key("빠른 질문")] = [0.0]
+        rag_repo._embedding_cache[_embedding_key("느린 질문")] = [0.2]
+        batcher = RAGBatcher(rag_repo, max_batch=2, max_wait=0.05)
+
+        fast = asyncio.create_task(batcher.submit("빠른 질문"))
+        slow = asyncio.create_task(batcher.submit("느린 질문"))
+        done, _ = await asyncio.wait({fast, slow}, return_when=asyncio.FIRST_COMPLETED)
+
+        assert done == {fast}
+        assert (await slow)[0]["content"] == "delay=0.2"
+
+
+def _conversation(turns: int) -> list:
+    """turns턴(사용자/AI 쌍)의 대화 메시지 목록"""
+    messages = []
+    for turn in range(turns):
+        messages.append(HumanMessage(content=f"질문 {turn}"))
+        messages.append(AIMessage(content=f"답변 {turn}"))
+    return messages
+
+
+def _redis_range(items: list, start: int, end: int) -> list:
+    """Redis LRANGE/LTRIM의 start~end(양끝 포함, -1은 끝) 구간"""
+    return items[start : None if end == -1 else end + 1]
+
+
+class _FakeRedisPipeline:
+    """명령을 모았다가 execute()에서 순서대로 실행하는 파이프라인"""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def rpush(self, key, *values):
+        self.commands.append(
+            lambda: self.client.lists.setdefault(key, []).extend(values)
         )
 
-        assert result["success"] is True
-        assert "data" in result
-        assert "temperature" in result["data"]
-        assert result.get("mock") is True
+    def ltrim(self, key, start, end):
+        def trim():
+            items = self.client.lists.get(key, [])
+            self.client.lists[key] = _redis_range(items, start, end)
 
-    @pytest.mark.asyncio
-    async def test_unknown_tool(self, executor):
-        """알 수 없는 Tool 테스트"""
-        result = await executor.execute(
-            tool_name="unknown_tool",
-            tool_args={},
-            session_id="test-session",
+        self.commands.append(trim)
+
+    def expire(self, key, seconds):
+        self.commands.append(lambda: self.client.ttls.__setitem__(key, seconds))
+
+    async def execute(self):
+        for command in self.commands:
+            command()
+
+
+class _FakeRedis:
+    """RedisSessionRepository가 사용하는 명령만 구현한 redis.asyncio 대용 클라이언트"""
+
+    def __init__(self):
+        self.lists: dict[str, list[bytes]] = {}
+        self.values: dict[str, bytes] = {}
+        self.ttls: dict[str, int] = {}
+
+    def pipeline(self, transaction=True):
+        return _FakeRedisPipeline(self)
+
+    async def lrange(self, key, start, end):
+        return _redis_range(self.lists.get(key, []), start, end)
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value.encode()
+        self.ttls[key] = ex
+
+
+class TestSessionRepository:
+    """세션 Repository 테스트"""
+
+    async def test_append_keeps_last_max_turns(self):
+        """2 * max_turns개를 넘게 추가하면 최근 메시지만 남고 역할도 유지"""
+        repo = SessionRepository()
+        messages = _conversation(settings.max_turns + 2)
+
+        for message in messages:
+            await repo.append("trim-session", [message])
+        history = await repo.get_history("trim-session")
+
+        expected = messages[-2 * settings.max_turns :]
+        assert [type(m) for m in history] == [type(m) for m in expected]
+        assert [m.content for m in history] == [m.content for m in expected]
+
+    async def test_append_refreshes_ttl(self):
+        """append할 때마다 세션 만료 시간이 갱신됨"""
+        now = [0.0]
+        repo = SessionRepository()
+        repo._store = TTLCache(maxsize=10, ttl=10, timer=lambda: now[0])
+
+        await repo.append("ttl-session", _conversation(1))
+        now[0] = 8
+        await repo.append("ttl-session", _conversation(1))
+        now[0] = 15  # 첫 append 기준으로는 만료, 두 번째 기준으로는 유효
+        assert len(await repo.get_history("ttl-session")) == 4
+
+        now[0] = 19
+        assert await repo.get_history("ttl-session") == []
+
+    async def test_redis_history_and_intent(self):
+        """Redis 저장소: 최근 메시지 유지, 역할 복원, TTL 설정, intent 저장"""
+        client = _FakeRedis()
+        repo = RedisSessionRepository(client)
+        messages = _conversation(settings.max_turns + 2)
+
+        await repo.append("redis-session", messages[:4])
+        await repo.append("redis-session", messages[4:])
+        history = await repo.get_history("redis-session")
+        await repo.set_last_intent("redis-session", "chat")
+
+        expected = messages[-2 * settings.max_turns :]
+        assert [type(m) for m in history] == [type(m) for m in expected]
+        assert [m.content for m in history] == [m.content for m in expected]
+        assert client.ttls["session:redis-session"] == settings.session_ttl
+        assert await repo.get_last_intent("redis-session") == "chat"
+        assert await repo.get_last_intent("other-session") is None
+
+
+@pytest.fixture(scope="module")
+def executor():
+    """ToolExecutor 인스턴스 생성 (상태가 없으므로 모듈 내 테스트가 공유)"""
+    return ToolExecutor()
+
+
+# (tool_name, tool_args, success, 추가 검증)
+_MOCK_TOOL_CASES = [
+    (
+        "recommend_song",
+        {"mood": "happy"},
+        True,
+        lambda r: "song" in r["data"] and r.get("mock") is True,
+    ),
+    ("recommend_song", {"mood": "sad"}, True, lambda r: r["data"]["mood"] == "sad"),
+    (
+        "get_weather",
+        {},
+        True,
+        lambda r: "temperature" in r["data"] and r.get("mock") is True,
+    ),
+    ("unknown_tool", {}, False, lambda r: "error" in r),
+]
+
+
+class TestToolExecutor:
+    """Tool Executor 테스트"""
+
+    async def test_mock_tools(self, executor):
+        """Mock Tool 실행 테스트 (노래 추천 happy/sad, 날씨, 알 수 없는 Tool)"""
+        for tool_name, tool_args, success, check in _MOCK_TOOL_CASES:
+            result = await executor.execute(
+                tool_name=tool_name,
+                tool_args=tool_args,
+                session_id="test-session",
+            )
+
+            assert result["success"] is success, (tool_name, result)
+            assert check(result), (tool_name, result)
+
+    async def test_execute_concurrent(self, executor):
+        """공유 executor로 독립적인 Tool 호출을 동시에 실행"""
+        song, weather, unknown = await asyncio.gather(
+            executor.execute("recommend_song", {"mood": "focus"}, "test-session"),
+            executor.execute("get_weather", {}, "test-session"),
+            executor.execute("unknown_tool", {}, "test-session"),
         )
 
-        assert result["success"] is False
-        assert "error" in result
+        assert song["success"] is True
+        assert song["data"]["mood"] == "focus"
+        assert weather["success"] is True
+        assert unknown["success"] is False
 
-    @pytest.mark.asyncio
+    @pytest.mark.integration
+    @requires_integration
     async def test_get_schedule_real(self, executor):
         """스케줄 조회 테스트 (Real/Empty)"""
         result = await executor.execute(
@@ -183,7 +598,8 @@ class TestToolExecutor:
         assert "data" in result
         assert isinstance(result["data"]["schedules"], list)
 
-    @pytest.mark.asyncio
+    @pytest.mark.integration
+    @requires_integration
     async def test_send_fan_letter_mock(self, executor):
         """팬레터 저장 테스트 (Mock)"""
         result = await executor.execute(
@@ -7,19 +7,73 @@ pytest를 사용하여 API 엔드포인트를 테스트합니다.
     uv run pytest tests/test_api.py -v
 """
 
-from unittest.mock import AsyncMock, patch
+import asyncio
+from contextlib import aclosing
+from unittest.mock import patch
 
+import orjson
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
-from langchain_core.messages import AIMessage, HumanMessage
+from httpx import ASGITransport, AsyncClient
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
 
+from app.api.routes.chat import stream_with_status
 from app.main import app
+from app.schemas.chat import StreamEvent
+from app.ui import StreamSanitizer, sanitize_for_gradio_markdown
 
+# Mock 그래프 실행 결과 (메시지는 임포트 시 한 번만 생성)
+_HUMAN = HumanMessage(content="안녕")
+_AI = AIMessage(content="반가워! 루미야~")
+_CHAT_RETURN = {"messages": [_HUMAN, _AI], "tool_name": None}
 
-@pytest.fixture
+# 요청 바디 (orjson으로 한 번만 직렬화해서 content=로 재사용)
+_CHAT_BODY = orjson.dumps({"message": "안녕", "session_id": "test-session"})
+_JSON_HEADERS = {"content-type": "application/json"}
+
+
+@pytest.fixture(scope="module")
 def client():
-    """FastAPI 테스트 클라이언트를 생성합니다."""
-    return TestClient(app)
+    """
+    FastAPI 테스트 클라이언트를 생성합니다. (모듈 내 테스트가 공유)
+
+    with 블록 없이 생성하므로 lifespan(설정 검증, LLM/임베딩/Supabase 워밍업)은
+    실행되지 않습니다. 라우팅/유효성 검사만 확인하는 테스트에는 앱 시작이 필요 없습니다.
+    """
+    client = TestClient(app)
+    yield client
+    client.close()
+
+
+class _StubGraph:
+    """ainvoke만 있는 최소 그래프 (AsyncMock 대신 사용)"""
+
+    async def ainvoke(self, *args, **kwargs):
+        return _CHAT_RETURN
+
+
+class _FloodGraph:
+    """토큰을 끝없이 쏟아내는 그래프 (스트리밍 큐를 가득 채우는 용도)"""
+
+    async def astream(self, *args, **kwargs):
+        for _ in range(1000):
+            yield ("messages", (AIMessageChunk(content="a"), {}))
+
+
+@pytest.fixture(scope="module")
+def mock_graph():
+    """Mock 그래프 (모듈 내 채팅 테스트가 공유)"""
+    return _StubGraph()
+
+
+@pytest_asyncio.fixture
+async def aclient():
+    """비동기 테스트 클라이언트 (스레드 없이 같은 이벤트 루프에서 앱 호출)"""
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
 
 
 class TestRootEndpoint:
@@ -32,54 +86,95 @@ class TestRootEndpoint:
         assert "/ui" in response.headers.get("location", "")
 
 
+class TestHealthEndpoint:
+    """헬스체크 엔드포인트 테스트"""
+
+    def test_health_check(self, client):
+        """헬스체크 테스트"""
+        response = client.get("/api/v1/health/")
+        assert response.status_code == 200
+        assert response.json()["status"] == "healthy"
+
+
 class TestChatEndpoints:
     """채팅 API 엔드포인트 테스트"""
 
-    @patch("app.api.routes.chat.get_lumi_graph")
-    def test_chat_success(self, mock_get_graph, client):
+    async def test_chat_success(self, mock_graph, aclient):
         """채팅 성공 테스트 (Mock 사용)"""
-        # Mock Graph 설정
-        mock_graph = AsyncMock()
-        mock_get_graph.return_value = mock_graph
-
-        # Mock 실행 결과 설정
-        mock_graph.ainvoke.return_value = {
-            "messages": [
-                HumanMessage(content="안녕"),
-                AIMessage(content="반가워! 루미야~"),
-            ],
-            "tool_name": None,
-        }
-
-        response = client.post(
-            "/api/v1/chat/",
-            json={
-                "message": "안녕",
-                "session_id": "test-session",
-            },
-        )
+        with patch("app.api.routes.chat.get_lumi_graph", return_value=mock_graph):
+            response = await aclient.post(
+                "/api/v1/chat/", content=_CHAT_BODY, headers=_JSON_HEADERS
+            )
 
         assert response.status_code == 200
         data = response.json()
         assert data["message"] == "반가워! 루미야~"
         assert data["tool_used"] is None
 
-    def test_chat_validation_error(self, client):
+    @pytest.mark.parametrize(
+        "body",
+        [
+            orjson.dumps({"session_id": "test-session"}),  # message 누락
+            orjson.dumps({"message": "안녕!"}),  # session_id 누락
+        ],
+    )
+    def test_chat_validation_error(self, client, body):
         """유효성 검사 오류 테스트"""
-        # message 누락
-        response = client.post(
-            "/api/v1/chat/",
-            json={
-                "session_id": "test-session",
-            },
-        )
+        response = client.post("/api/v1/chat/", content=body, headers=_JSON_HEADERS)
         assert response.status_code == 422  # Validation Error
 
-        # session_id 누락
-        response = client.post(
-            "/api/v1/chat/",
-            json={
-                "message": "안녕!",
-            },
-        )
-        assert response.status_code == 422
+    async def test_stream_disconnect_with_full_queue(self):
+        """큐가 가득 찬 상태에서 연결이 끊겨도 pump 태스크가 종료되는지 확인"""
+        tasks = []
+        create_task = asyncio.create_task
+
+        def track(coro, **kwargs):
+            task = create_task(coro, **kwargs)
+            tasks.append(task)
+            return task
+
+        with (
+            patch("app.api.routes.chat.get_lumi_graph", return_value=_FloodGraph()),
+            patch("asyncio.create_task", side_effect=track),
+        ):
+            async with aclosing(stream_with_status("안녕", "disconnect")) as stream:
+                await anext(stream)
+                await asyncio.sleep(0.01)  # pump가 큐를 다시 채울 시간
+
+        assert tasks and all(task.done() for task in tasks)
+
+
+class TestStreamEvent:
+    """SSE 이벤트 직렬화 테스트"""
+
+    def test_to_sse_excludes_none(self):
+        """None 필드는 제외하고 data: {...}\\n\\n 바이트로 변환"""
+        sse = StreamEvent(type="response", content="안녕!", tool_used=None).to_sse()
+
+        assert isinstance(sse, bytes)
+        assert sse.startswith(b"data: ")
+        assert sse.endswith(b"\n\n")
+        assert orjson.loads(sse[len(b"data: ") :]) == {
+            "type": "response",
+            "content": "안녕!",
+        }
+
+    def test_to_sse_key_order_is_stable(self):
+        """JSON 키는 인자 순서와 관계없이 필드 정의 순서 (프레임 바이트가 항상 같음)"""
+        sse = StreamEvent(content="안녕", type="token").to_sse()
+
+        assert sse == 'data: {"type":"token","content":"안녕"}\n\n'.encode()
+
+
+class TestStreamSanitizer:
+    """Gradio 증분 마크다운 변환 테스트"""
+
+    def test_feed_matches_full_sanitize(self):
+        """토큰 경계에 걸친 ~, **\" 도 전체 변환 결과와 같아야 함"""
+        tokens = ["루미너스", "~", "~! ", "*", '*"안녕', '"*', "*~", " 끝~"]
+        sanitizer = StreamSanitizer()
+        accumulated = ""
+
+        for token in tokens:
+            accumulated += token
+            assert sanitizer.feed(token) == sanitize_for_gradio_markdown(accumulated)